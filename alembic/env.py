@@ -15,7 +15,7 @@ from src.schemas.notion_cache import (  # Import cache models
     CachedTeamMember,
     CachedNotionTodo
 )
-from src.schemas.person import Person, ConversationActivity, TaskActivity, ActivitySummary  # Person models
+from src.schemas.person import Person, ConversationActivity, TaskActivity, ActivitySummary, ActivitySyncState  # Person models
 from src.core.config import Config
 
 
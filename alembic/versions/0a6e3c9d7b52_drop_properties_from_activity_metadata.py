@@ -0,0 +1,36 @@
+"""drop_properties_from_activity_metadata
+
+Revision ID: 0a6e3c9d7b52
+Revises: f3b8d1c6e527
+Create Date: 2026-10-16 19:04:12.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6e3c9d7b52'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d1c6e527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The sync no longer stores the raw Notion properties; strip them from
+    # existing rows too (sync upserts keep the metadata already stored)
+    for table in ('conversation_activities', 'task_activities'):
+        op.execute(
+            f"UPDATE {table} SET notion_metadata = notion_metadata - 'properties' "
+            "WHERE notion_metadata ? 'properties'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The stripped properties can't be restored; a full re-sync would
+    # not bring them back either, since the sync no longer writes them
+    pass
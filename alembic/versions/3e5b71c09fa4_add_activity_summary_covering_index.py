@@ -0,0 +1,28 @@
+"""add_activity_summary_covering_index
+
+Revision ID: 3e5b71c09fa4
+Revises: a4d2f8c61e07
+Create Date: 2026-10-16 15:31:08.447190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e5b71c09fa4'
+down_revision: Union[str, Sequence[str], None] = 'a4d2f8c61e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activity_person_date_covering', 'activity_summaries', ['person_id', 'date'], unique=False, postgresql_include=['total_activity_score', 'conversations_created', 'tasks_completed'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_person_date_covering', table_name='activity_summaries', postgresql_include=['total_activity_score', 'conversations_created', 'tasks_completed'])
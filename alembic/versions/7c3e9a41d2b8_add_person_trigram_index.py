@@ -0,0 +1,29 @@
+"""add_person_trigram_index
+
+Revision ID: 7c3e9a41d2b8
+Revises: 1b887e24f5fd
+Create Date: 2026-10-16 14:21:37.612904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a41d2b8'
+down_revision: Union[str, Sequence[str], None] = '1b887e24f5fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_person_trgm', 'persons', ['username', 'email'], unique=False, postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops', 'email': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_person_trgm', table_name='persons', postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops', 'email': 'gin_trgm_ops'})
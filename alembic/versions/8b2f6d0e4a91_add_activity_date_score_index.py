@@ -0,0 +1,30 @@
+"""add_activity_date_score_index
+
+Revision ID: 8b2f6d0e4a91
+Revises: 3e5b71c09fa4
+Create Date: 2026-10-16 16:02:47.512930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2f6d0e4a91'
+down_revision: Union[str, Sequence[str], None] = '3e5b71c09fa4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activity_date_score', 'activity_summaries', ['date', 'total_activity_score'], unique=False, postgresql_include=['person_id', 'conversations_created', 'tasks_completed'])
+    op.drop_index(op.f('ix_activity_date'), table_name='activity_summaries')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_activity_date'), 'activity_summaries', ['date'], unique=False)
+    op.drop_index('ix_activity_date_score', table_name='activity_summaries', postgresql_include=['person_id', 'conversations_created', 'tasks_completed'])
@@ -0,0 +1,53 @@
+"""cached_dates_as_date_columns
+
+Revision ID: a4d2f8c61e07
+Revises: 7c3e9a41d2b8
+Create Date: 2026-10-16 14:48:12.270531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2f8c61e07'
+down_revision: Union[str, Sequence[str], None] = '7c3e9a41d2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('cached_notion_tasks', 'due_date',
+               existing_type=sa.String(length=100),
+               type_=sa.Date(),
+               existing_nullable=True,
+               postgresql_using="NULLIF(due_date, '')::date")
+    op.alter_column('cached_notion_todos', 'deadline',
+               existing_type=sa.String(length=100),
+               type_=sa.Date(),
+               existing_nullable=True,
+               postgresql_using="NULLIF(deadline, '')::date")
+    op.alter_column('cached_notion_todos', 'date_done',
+               existing_type=sa.String(length=100),
+               type_=sa.Date(),
+               existing_nullable=True,
+               postgresql_using="NULLIF(date_done, '')::date")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('cached_notion_todos', 'date_done',
+               existing_type=sa.Date(),
+               type_=sa.String(length=100),
+               existing_nullable=True)
+    op.alter_column('cached_notion_todos', 'deadline',
+               existing_type=sa.Date(),
+               type_=sa.String(length=100),
+               existing_nullable=True)
+    op.alter_column('cached_notion_tasks', 'due_date',
+               existing_type=sa.Date(),
+               type_=sa.String(length=100),
+               existing_nullable=True)
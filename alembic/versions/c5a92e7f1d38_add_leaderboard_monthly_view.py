@@ -0,0 +1,43 @@
+"""add_leaderboard_monthly_view
+
+Revision ID: c5a92e7f1d38
+Revises: 8b2f6d0e4a91
+Create Date: 2026-10-16 16:40:12.908314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a92e7f1d38'
+down_revision: Union[str, Sequence[str], None] = '8b2f6d0e4a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-person monthly totals backing the monthly/yearly/all-time leaderboards.
+    # Months are taken in UTC, matching the UTC-midnight summary dates.
+    op.execute("""
+        CREATE MATERIALIZED VIEW leaderboard_monthly AS
+        SELECT
+            date_trunc('month', date AT TIME ZONE 'UTC')::date AS month,
+            person_id,
+            SUM(total_activity_score) AS score,
+            SUM(conversations_created) AS convs,
+            SUM(tasks_completed) AS tasks
+        FROM activity_summaries
+        GROUP BY 1, 2
+    """)
+    # REFRESH ... CONCURRENTLY requires a unique index
+    op.create_index('ix_leaderboard_monthly_month_person', 'leaderboard_monthly', ['month', 'person_id'], unique=True)
+    op.create_index('ix_leaderboard_monthly_month_score', 'leaderboard_monthly', ['month', sa.text('score DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_monthly")
@@ -0,0 +1,47 @@
+"""activity_metadata_as_jsonb
+
+Revision ID: d81f4b6a2c05
+Revises: c5a92e7f1d38
+Create Date: 2026-10-16 17:05:33.270416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f4b6a2c05'
+down_revision: Union[str, Sequence[str], None] = 'c5a92e7f1d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('conversation_activities', 'notion_metadata',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='notion_metadata::jsonb')
+    op.alter_column('task_activities', 'notion_metadata',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='notion_metadata::jsonb')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('task_activities', 'notion_metadata',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='notion_metadata::json')
+    op.alter_column('conversation_activities', 'notion_metadata',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='notion_metadata::json')
@@ -0,0 +1,58 @@
+"""activity_summary_date_as_date
+
+Revision ID: e2c7a9b40f16
+Revises: d81f4b6a2c05
+Create Date: 2026-10-16 17:48:20.613952
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7a9b40f16'
+down_revision: Union[str, Sequence[str], None] = 'd81f4b6a2c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_leaderboard_view(month_expr: str) -> None:
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW leaderboard_monthly AS
+        SELECT
+            {month_expr} AS month,
+            person_id,
+            SUM(total_activity_score) AS score,
+            SUM(conversations_created) AS convs,
+            SUM(tasks_completed) AS tasks
+        FROM activity_summaries
+        GROUP BY 1, 2
+    """)
+    op.create_index('ix_leaderboard_monthly_month_person', 'leaderboard_monthly', ['month', 'person_id'], unique=True)
+    op.create_index('ix_leaderboard_monthly_month_score', 'leaderboard_monthly', ['month', sa.text('score DESC')], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The view depends on activity_summaries.date, so it is rebuilt around the type change
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_monthly")
+    # Summaries are keyed by UTC midnight; keep the UTC calendar day
+    op.alter_column('activity_summaries', 'date',
+               existing_type=sa.DateTime(timezone=True),
+               type_=sa.Date(),
+               existing_nullable=False,
+               postgresql_using="(date AT TIME ZONE 'UTC')::date")
+    _create_leaderboard_view("date_trunc('month', date)::date")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS leaderboard_monthly")
+    op.alter_column('activity_summaries', 'date',
+               existing_type=sa.Date(),
+               type_=sa.DateTime(timezone=True),
+               existing_nullable=False,
+               postgresql_using="date::timestamp AT TIME ZONE 'UTC'")
+    _create_leaderboard_view("date_trunc('month', date AT TIME ZONE 'UTC')::date")
@@ -0,0 +1,37 @@
+"""tune_activity_summaries_storage
+
+Revision ID: f3b8d1c6e527
+Revises: e2c7a9b40f16
+Create Date: 2026-10-16 18:26:41.084733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1c6e527'
+down_revision: Union[str, Sequence[str], None] = 'e2c7a9b40f16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Leave free space in each page so re-aggregation upserts that don't change
+    # indexed values can be HOT updates (no new index entries)
+    op.execute("ALTER TABLE activity_summaries SET (fillfactor = 80)")
+    # Tell the planner how person_id and date correlate
+    op.execute(
+        "CREATE STATISTICS activity_summaries_pid_date (dependencies) "
+        "ON person_id, date FROM activity_summaries"
+    )
+    op.execute("ANALYZE activity_summaries")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP STATISTICS IF EXISTS activity_summaries_pid_date")
+    op.execute("ALTER TABLE activity_summaries RESET (fillfactor)")
@@ -49,6 +49,11 @@ celery_app.conf.beat_schedule = {
         "task": "src.tasks.notion_cache_tasks.update_activities_cache",
         "schedule": crontab(hour="*/12", minute="0"),  # Every 12 hours at :00 (0:00, 12:00)
     },
+    # Leaderboard materialized view - nightly catch-up refresh
+    "refresh-leaderboard": {
+        "task": "src.tasks.notion_cache_tasks.refresh_leaderboard",
+        "schedule": crontab(hour="3", minute="0"),  # Every day at 03:00 UTC
+    },
 }
 
 if __name__ == "__main__":
@@ -9,8 +9,10 @@ from __future__ import annotations
 
 import logging
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import structlog
 from structlog.types import FilteringBoundLogger
@@ -102,4 +104,33 @@ def bind_context(**kwargs: Any) -> None:
 
 def clear_context() -> None:
     """Clear all bound context variables."""
-    structlog.contextvars.clear_contextvars()
\ No newline at end of file
+    structlog.contextvars.clear_contextvars()
+
+
+@contextmanager
+def timed(stage: str, logger: FilteringBoundLogger | None = None, **fields: Any) -> Iterator[dict]:
+    """
+    Measure a block with a monotonic clock and log its duration.
+
+    Args:
+        stage: Name of the stage, logged as the ``stage`` field
+        logger: Logger to emit to (defaults to this module's logger)
+        **fields: Extra context to include in the log entry
+
+    Yields:
+        Dict that receives ``duration_seconds`` once the block exits
+
+    Example:
+        >>> with timed("sync", logger) as span:
+        ...     await sync_service.sync_all()
+        >>> span["duration_seconds"]
+    """
+    span: dict = {}
+    start = time.perf_counter_ns()
+    try:
+        yield span
+    finally:
+        span["duration_seconds"] = (time.perf_counter_ns() - start) / 1e9
+        (logger or get_logger(__name__)).info(
+            "stage_timed", stage=stage, duration_seconds=span["duration_seconds"], **fields
+        )
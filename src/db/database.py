@@ -12,10 +12,13 @@ config = Config()
 engine = create_async_engine(
     config.db_url,
     echo=False,
+    # One app-wide pool shared by every repository: 10 steady connections
+    # plus 5 for bursts, kept well under Postgres' max_connections
+    pool_size=10,
+    max_overflow=5,
     pool_pre_ping=True,
-    pool_recycle=3600,
-    pool_timeout=20,
-    max_overflow=0,
+    pool_recycle=1800,
+    pool_timeout=30,
 )
 
 AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
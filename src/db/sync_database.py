@@ -13,6 +13,7 @@ sync_engine = create_engine(
     pool_size=10,
     max_overflow=20,
     pool_pre_ping=True,
+    insertmanyvalues_page_size=5000,  # Rows per multi-row INSERT in executemany upserts (upsert_projects)
     echo=False
 )
 
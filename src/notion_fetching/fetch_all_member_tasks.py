@@ -198,4 +198,10 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    # uvloop is optional (no Windows wheels); fall back to the stock loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -134,4 +134,10 @@ async def fetch_kanban_data():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    asyncio.run(fetch_kanban_data())
+    # uvloop is optional (no Windows wheels); fall back to the stock loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(fetch_kanban_data())
+    else:
+        uvloop.run(fetch_kanban_data())
@@ -139,4 +139,11 @@ async def fetch_database():
         except Exception as e:
             print(f'   Error fetching blocks: {str(e)}')
 
-asyncio.run(fetch_database())
+if __name__ == "__main__":
+    # uvloop is optional (no Windows wheels); fall back to the stock loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(fetch_database())
+    else:
+        uvloop.run(fetch_database())
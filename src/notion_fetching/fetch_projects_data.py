@@ -156,4 +156,10 @@ async def fetch_projects_data():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    asyncio.run(fetch_projects_data())
+    # uvloop is optional (no Windows wheels); fall back to the stock loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(fetch_projects_data())
+    else:
+        uvloop.run(fetch_projects_data())
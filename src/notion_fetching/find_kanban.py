@@ -1,162 +1,148 @@
+import argparse
 import asyncio
-from src.clients.notion_client import NotionClient
 
-async def find_kanban_database():
+from src.notion_fetching.finder import find
+
+
+def kanban_predicate(db, properties):
+    """
+    Match Kanban board databases with:
+    - Assignee/Responsible person field
+    - Project/Task name field
+    - Status field (especially with red/green/blue or similar)
+    """
+    person_fields = []
+    status_fields = []
+    status_field = None
+    title_field = None
+
+    for prop_name, prop_data in properties.items():
+        prop_type = prop_data.get("type")
+
+        # Check for person/people field
+        if prop_type == "people":
+            person_fields.append(prop_name)
+
+        # Check for status/select field
+        if prop_type in ["status", "select"]:
+            status_fields.append(prop_name)
+            if status_field is None:
+                status_field = prop_name
+
+            # Check if it has color-based options
+            if prop_type == "select":
+                options = prop_data.get("select", {}).get("options", [])
+                colors = [opt.get("color") for opt in options]
+                if any(c in ["red", "green", "blue"] for c in colors):
+                    status_fields[-1] += " (has red/green/blue colors!)"
+            elif prop_type == "status":
+                groups = prop_data.get("status", {}).get("groups", [])
+                colors = []
+                for group in groups:
+                    colors.extend([opt.get("color") for opt in group.get("options", [])])
+                if any(c in ["red", "green", "blue"] for c in colors):
+                    status_fields[-1] += " (has red/green/blue colors!)"
+
+        # Check for title field
+        if prop_type == "title":
+            title_field = prop_name
+
+    # If it matches Kanban criteria, it's a candidate!
+    if not (person_fields and status_fields and title_field):
+        return None
+
+    return {
+        "person_fields": person_fields,
+        "status_fields": status_fields,
+        "status_field": status_field,
+        "title_field": title_field,
+        "properties": properties
+    }
+
+
+def render_kanban(out, db, properties, candidate):
+    """Print the report for a Kanban candidate; other databases are skipped."""
+    if candidate is None:
+        return
+
+    print("⭐" * 40, file=out)
+    print(f"🎯 KANBAN CANDIDATE #{candidate['number']}: {candidate['title']}", file=out)
+    print("⭐" * 40, file=out)
+    print(f"📌 Database ID: {candidate['id']}", file=out)
+    print(f"🔗 URL: {candidate['url']}", file=out)
+    print(f"\n✅ MATCHES KANBAN CRITERIA:", file=out)
+    print(f"   👤 Person fields: {', '.join(candidate['person_fields'])}", file=out)
+    print(f"   📊 Status fields: {', '.join(candidate['status_fields'])}", file=out)
+    print(f"   📝 Title field: {candidate['title_field']}", file=out)
+    print(f"\n📊 All Properties ({len(properties)} columns):", file=out)
+    for prop_name, prop_data in properties.items():
+        prop_type = prop_data.get("type")
+        print(f"   • {prop_name} ({prop_type})", file=out)
+
+    if "sample_error" in candidate:
+        print(f"\n⚠️  Could not fetch sample data: {candidate['sample_error']}", file=out)
+    else:
+        pages = candidate["sample_pages"]
+        print(f"\n📦 Contains {len(pages)} sample page(s):", file=out)
+
+        # Field names and types are known from the schema,
+        # so look them up directly instead of scanning every property
+        title_field = candidate["title_field"]
+        person_field = candidate["person_fields"][0]
+        status_field = candidate["status_field"]
+        status_type = candidate["prop_types"][status_field]
+
+        for page in pages[:3]:
+            props = page.get("properties", {})
+
+            # Extract key fields
+            title_val = "N/A"
+            person_val = "N/A"
+            status_val = "N/A"
+
+            title_texts = props.get(title_field, {}).get("title", [])
+            if title_texts:
+                title_val = title_texts[0].get("plain_text", "N/A")
+
+            people_list = props.get(person_field, {}).get("people", [])
+            if people_list:
+                person_val = people_list[0].get("name", "N/A")
+
+            status_data = props.get(status_field, {}).get(status_type)
+            if status_data:
+                status_val = f"{status_data.get('name', 'N/A')} ({status_data.get('color', '')})"
+
+            print(f"\n      📄 {title_val}", file=out)
+            print(f"         👤 Responsible: {person_val}", file=out)
+            print(f"         🚦 Status: {status_val}", file=out)
+
+    print("\n", file=out)
+
+
+async def find_kanban_database(max_candidates=None):
     """
     Search for Kanban board databases with:
     - Assignee/Responsible person field
     - Project/Task name field
     - Status field (especially with red/green/blue or similar)
+
+    Args:
+        max_candidates: Stop searching once this many candidates are found
     """
-    client = NotionClient()
-    
     print("=" * 80)
     print("🔍 SEARCHING FOR KANBAN BOARD DATABASE")
     print("Looking for: Person field + Status field + Project/Task name")
     print("=" * 80)
     print()
-    
-    # Search for all databases
-    search_results = await client.client.search(
-        filter={"property": "object", "value": "database"}
+
+    kanban_candidates = await find(
+        kanban_predicate, render_kanban, sample_size=3, max_matches=max_candidates
     )
-    
-    databases = search_results.get("results", [])
-    print(f"📊 Found {len(databases)} total databases\n")
-    
-    kanban_candidates = []
-    
-    for idx, db in enumerate(databases, 1):
-        db_id = db["id"]
-        title = db.get("title", [{}])[0].get("plain_text", "Untitled")
-        
-        # Get full database details
-        try:
-            db_details = await client.get_database(db_id)
-            properties = db_details.get("properties", {})
-            
-            # Check for Kanban-like structure
-            has_person = False
-            has_status = False
-            has_title = False
-            
-            person_fields = []
-            status_fields = []
-            title_field = None
-            
-            for prop_name, prop_data in properties.items():
-                prop_type = prop_data.get("type")
-                
-                # Check for person/people field
-                if prop_type == "people":
-                    has_person = True
-                    person_fields.append(prop_name)
-                
-                # Check for status/select field
-                if prop_type in ["status", "select"]:
-                    has_status = True
-                    status_fields.append(prop_name)
-                    
-                    # Check if it has color-based options
-                    if prop_type == "select":
-                        options = prop_data.get("select", {}).get("options", [])
-                        colors = [opt.get("color") for opt in options]
-                        if any(c in ["red", "green", "blue"] for c in colors):
-                            status_fields[-1] += " (has red/green/blue colors!)"
-                    elif prop_type == "status":
-                        groups = prop_data.get("status", {}).get("groups", [])
-                        colors = []
-                        for group in groups:
-                            colors.extend([opt.get("color") for opt in group.get("options", [])])
-                        if any(c in ["red", "green", "blue"] for c in colors):
-                            status_fields[-1] += " (has red/green/blue colors!)"
-                
-                # Check for title field
-                if prop_type == "title":
-                    has_title = True
-                    title_field = prop_name
-            
-            # If it matches Kanban criteria, it's a candidate!
-            if has_person and has_status and has_title:
-                kanban_candidates.append({
-                    "index": idx,
-                    "id": db_id,
-                    "title": title,
-                    "url": db.get("url", ""),
-                    "person_fields": person_fields,
-                    "status_fields": status_fields,
-                    "title_field": title_field,
-                    "properties": properties
-                })
-                
-                print("⭐" * 40)
-                print(f"🎯 KANBAN CANDIDATE #{len(kanban_candidates)}: {title}")
-                print("⭐" * 40)
-                print(f"📌 Database ID: {db_id}")
-                print(f"🔗 URL: {db.get('url', '')}")
-                print(f"\n✅ MATCHES KANBAN CRITERIA:")
-                print(f"   👤 Person fields: {', '.join(person_fields)}")
-                print(f"   📊 Status fields: {', '.join(status_fields)}")
-                print(f"   📝 Title field: {title_field}")
-                print(f"\n📊 All Properties ({len(properties)} columns):")
-                for prop_name, prop_data in properties.items():
-                    prop_type = prop_data.get("type")
-                    print(f"   • {prop_name} ({prop_type})")
-                
-                # Try to get sample data
-                try:
-                    sample = await client.query_database(db_id, page_size=3)
-                    pages = sample.get("results", [])
-                    print(f"\n📦 Contains {len(pages)} sample page(s):")
-                    
-                    for page in pages[:3]:
-                        props = page.get("properties", {})
-                        
-                        # Extract key fields
-                        title_val = "N/A"
-                        person_val = "N/A"
-                        status_val = "N/A"
-                        
-                        for prop_name, prop_data in props.items():
-                            prop_type = prop_data.get("type")
-                            
-                            if prop_type == "title":
-                                title_texts = prop_data.get("title", [])
-                                if title_texts:
-                                    title_val = title_texts[0].get("plain_text", "N/A")
-                            
-                            elif prop_type == "people":
-                                people_list = prop_data.get("people", [])
-                                if people_list:
-                                    person_val = people_list[0].get("name", "N/A")
-                            
-                            elif prop_type in ["status", "select"]:
-                                if prop_type == "status":
-                                    status_data = prop_data.get("status")
-                                    if status_data:
-                                        status_val = f"{status_data.get('name', 'N/A')} ({status_data.get('color', '')})"
-                                else:
-                                    select_data = prop_data.get("select")
-                                    if select_data:
-                                        status_val = f"{select_data.get('name', 'N/A')} ({select_data.get('color', '')})"
-                        
-                        print(f"\n      📄 {title_val}")
-                        print(f"         👤 Responsible: {person_val}")
-                        print(f"         🚦 Status: {status_val}")
-                
-                except Exception as e:
-                    print(f"\n⚠️  Could not fetch sample data: {e}")
-                
-                print("\n")
-        
-        except Exception as e:
-            print(f"❌ Error processing database #{idx}: {e}")
-            continue
-    
+
     print("\n" + "=" * 80)
     print(f"✨ SUMMARY: Found {len(kanban_candidates)} Kanban board candidate(s)")
     print("=" * 80)
-    
+
     if kanban_candidates:
         print("\n🎯 RECOMMENDED DATABASE(S):")
         for i, candidate in enumerate(kanban_candidates, 1):
@@ -166,7 +152,7 @@ async def find_kanban_database():
             print(f"   Person: {', '.join(candidate['person_fields'])}")
             print(f"   Status: {', '.join(candidate['status_fields'])}")
             print(f"   Title: {candidate['title_field']}")
-        
+
         print("\n" + "=" * 80)
         print("💡 To use a database, add this to your .env file:")
         print(f"   NOTION_DATABASE_ID={kanban_candidates[0]['id']}")
@@ -175,5 +161,33 @@ async def find_kanban_database():
         print("\n❌ No Kanban board databases found matching criteria")
         print("   (Looking for: person field + status field + title field)")
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Find Kanban board databases in Notion")
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument(
+        "--first",
+        action="store_const",
+        const=1,
+        dest="max_candidates",
+        help="Stop at the first Kanban candidate"
+    )
+    limit.add_argument(
+        "--max-candidates",
+        type=int,
+        metavar="N",
+        help="Stop after N Kanban candidates"
+    )
+    args = parser.parse_args()
+
+    # uvloop is optional (no Windows wheels); fall back to the stock loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(find_kanban_database(max_candidates=args.max_candidates))
+    else:
+        uvloop.run(find_kanban_database(max_candidates=args.max_candidates))
+
+
 if __name__ == "__main__":
-    asyncio.run(find_kanban_database())
+    main()
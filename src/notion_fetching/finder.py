@@ -0,0 +1,237 @@
+"""
+Shared helpers for the Notion database finder scripts.
+
+Each finder searches the workspace once, inspects every database
+concurrently under the shared rate limiter and prints a report through a
+script-specific ``render`` callback. Search results are cached at module
+scope with a short TTL so several finders run in one process share a
+single search.
+"""
+
+import asyncio
+import io
+import sys
+import time
+from typing import Callable, Dict, List, Optional, TextIO
+
+from notion_client import AsyncClient
+
+from src.clients.notion_client import get_notion_client
+from src.notion_fetching import schema_cache
+from src.notion_fetching.rate_limit import limited_call
+
+# predicate(db, properties) -> match details, or None if the database doesn't match
+Predicate = Callable[[dict, dict], Optional[dict]]
+# render(out, db, properties, match) writes the report for one database
+Renderer = Callable[[TextIO, dict, dict, Optional[dict]], None]
+
+# Search results shared by every finder in the process, refreshed after the TTL
+SEARCH_CACHE_TTL_SECONDS = 300
+_search_results: Optional[List[dict]] = None
+_search_fetched_at = 0.0
+_search_lock = asyncio.Lock()
+
+
+async def list_all_databases(notion: AsyncClient) -> List[dict]:
+    """
+    Return all databases visible to the integration.
+
+    The paginated search runs at most once per ``SEARCH_CACHE_TTL_SECONDS``;
+    concurrent and later callers in the same process reuse the result.
+
+    Args:
+        notion: Notion client
+
+    Returns:
+        List of database objects from the search response
+    """
+    global _search_results, _search_fetched_at
+
+    async with _search_lock:
+        if _search_results is None or time.monotonic() - _search_fetched_at > SEARCH_CACHE_TTL_SECONDS:
+            databases = []
+            start_cursor = None
+
+            while True:
+                params = {"filter": {"property": "object", "value": "database"}, "page_size": 100}
+                if start_cursor:
+                    params["start_cursor"] = start_cursor
+
+                response = await limited_call(notion.search, **params)
+                databases.extend(response.get("results", []))
+
+                start_cursor = response.get("next_cursor")
+                if not response.get("has_more") or not start_cursor:
+                    break
+
+            _search_results = databases
+            _search_fetched_at = time.monotonic()
+
+    return _search_results
+
+
+def database_title(db: dict, default: str = "Untitled") -> str:
+    """Join a database's title rich text into plain text."""
+    title = "".join(t.get("plain_text", "") for t in db.get("title", []))
+    return title or default
+
+
+async def get_properties(notion: AsyncClient, db: dict, cache: dict) -> dict:
+    """
+    Get a database's property schema.
+
+    Search results already include properties; the schema cache and
+    ``databases.retrieve`` are only used when they are missing.
+    """
+    properties = db.get("properties") or schema_cache.get_properties(cache, db)
+    if not properties:
+        details = await limited_call(notion.databases.retrieve, database_id=db["id"])
+        properties = details.get("properties", {})
+        schema_cache.put_properties(cache, db, properties)
+    return properties
+
+
+def property_types(properties: dict) -> Dict[str, str]:
+    """Map each property name in a database schema to its type."""
+    return {name: prop.get("type") for name, prop in properties.items()}
+
+
+def print_page_properties(
+    out: TextIO,
+    page: dict,
+    prop_types: Dict[str, str],
+    max_text: Optional[int] = None
+) -> None:
+    """
+    Print the readable property values of a sample page.
+
+    Args:
+        out: Stream to print to
+        page: Page object from a database query
+        prop_types: Property name -> type index built once from the schema
+        max_text: Truncate rich text values to this many characters
+    """
+    for prop_name, prop_value in page.get("properties", {}).items():
+        prop_type = prop_types.get(prop_name)
+
+        if prop_type == "title":
+            title_text = "".join([t["plain_text"] for t in prop_value.get("title", [])])
+            print(f"         {prop_name}: {title_text}", file=out)
+        elif prop_type == "status":
+            status = prop_value.get("status") or {}
+            if status:
+                print(f"         {prop_name}: {status.get('name', 'N/A')} (color: {status.get('color', 'N/A')})", file=out)
+        elif prop_type == "select":
+            select = prop_value.get("select") or {}
+            if select:
+                print(f"         {prop_name}: {select.get('name', 'N/A')} (color: {select.get('color', 'N/A')})", file=out)
+        elif prop_type == "people":
+            people = prop_value.get("people", [])
+            if people:
+                people_names = [p.get("name", p.get("id")) for p in people]
+                print(f"         {prop_name}: {', '.join(people_names)}", file=out)
+        elif prop_type == "rich_text":
+            text = "".join([t["plain_text"] for t in prop_value.get("rich_text", [])])
+            if text:
+                print(f"         {prop_name}: {text[:max_text]}", file=out)
+        elif prop_type == "relation":
+            relations = prop_value.get("relation", [])
+            if relations:
+                print(f"         {prop_name}: {len(relations)} related items", file=out)
+
+
+async def find(
+    predicate: Predicate,
+    render: Renderer,
+    sample_size: int = 3,
+    max_matches: Optional[int] = None
+) -> List[dict]:
+    """
+    Inspect every database in the workspace and report the matching ones.
+
+    Databases are inspected concurrently; reports are rendered afterwards in
+    search order and written to stdout in one go. With ``max_matches`` set,
+    inspection stops as soon as that many matches are found and the pending
+    inspections are cancelled, so only the databases inspected so far are
+    reported.
+
+    Args:
+        predicate: Returns match details for a database, or None
+        render: Writes the report for one database; called for every inspected database
+        sample_size: Number of sample pages to fetch for each match
+        max_matches: Stop after this many matches (None inspects every database)
+
+    Returns:
+        List of match dicts, each with "number", "id", "title", "url",
+        "prop_types" and either "sample_pages" or "sample_error" added
+    """
+    notion = get_notion_client()
+
+    databases = await list_all_databases(notion)
+    print(f"Found {len(databases)} databases total\n")
+
+    cache = schema_cache.load()
+
+    async def inspect(db):
+        properties = await get_properties(notion, db, cache)
+        match = predicate(db, properties)
+
+        if match is not None:
+            match["prop_types"] = property_types(properties)
+            try:
+                sample = await limited_call(
+                    notion.databases.query, database_id=db["id"], page_size=sample_size
+                )
+                match["sample_pages"] = sample.get("results", [])
+            except Exception as e:
+                match["sample_error"] = e
+
+        return properties, match
+
+    tasks = [asyncio.create_task(inspect(db)) for db in databases]
+    pending = set(tasks)
+    found = 0
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            found += sum(
+                1 for task in done
+                if task.exception() is None and task.result()[1] is not None
+            )
+            if max_matches is not None and found >= max_matches:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    schema_cache.save(cache)
+
+    matches = []
+    out = io.StringIO()
+
+    for idx, (db, task) in enumerate(zip(databases, tasks), 1):
+        if task.cancelled():
+            continue
+        if task.exception() is not None:
+            print(f"❌ Error processing database #{idx}: {task.exception()}", file=out)
+            continue
+
+        properties, match = task.result()
+        if match is not None:
+            # Several inspections can finish together; keep only the first ones in search order
+            if max_matches is not None and len(matches) >= max_matches:
+                continue
+            match.update(
+                number=len(matches) + 1,
+                id=db["id"],
+                title=database_title(db),
+                url=db.get("url", "")
+            )
+            matches.append(match)
+
+        render(out, db, properties, match)
+
+    sys.stdout.write(out.getvalue())
+    return matches
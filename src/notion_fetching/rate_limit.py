@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Bound concurrent Notion calls and space them to stay within the API quota.
+
+    Notion allows an average of 3 requests per second per integration token.
+    A semaphore caps how many calls are in flight, and acquisitions are spaced
+    at least ``1 / rate`` seconds apart, so fanning out with ``asyncio.gather``
+    does not trigger 429 responses.
+    """
+
+    def __init__(self, rate: int = 3, per: float = 1.0):
+        self._semaphore = asyncio.Semaphore(rate)
+        self._interval = per / rate
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+
+limiter = RateLimiter()
+
+
+async def limited_call(func, *args, **kwargs):
+    """
+    Await a Notion API call under the shared rate limiter.
+
+    Args:
+        func: Coroutine function to call (e.g. ``notion.databases.query``)
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        Whatever ``func`` returns
+    """
+    async with limiter:
+        return await func(*args, **kwargs)
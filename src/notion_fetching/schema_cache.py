@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+CACHE_PATH = Path(".notion_schema_cache.json")
+
+
+def load(path: Path = CACHE_PATH) -> dict:
+    """
+    Load cached database schemas from disk.
+
+    Args:
+        path: Location of the JSON cache file
+
+    Returns:
+        Mapping of database ID to {"last_edited_time", "properties"},
+        or an empty dict if the cache is missing or unreadable
+    """
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save(cache: dict, path: Path = CACHE_PATH) -> None:
+    """
+    Write cached database schemas to disk.
+
+    Args:
+        cache: Mapping of database ID to {"last_edited_time", "properties"}
+        path: Location of the JSON cache file
+    """
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    tmp_path.replace(path)
+
+
+def get_properties(cache: dict, db: dict):
+    """
+    Return cached properties for a database if its schema is unchanged.
+
+    Args:
+        cache: Loaded schema cache
+        db: Database object from a search response
+
+    Returns:
+        Cached properties dict, or None if missing or stale
+    """
+    cached = cache.get(db["id"])
+    if cached and cached.get("last_edited_time") == db.get("last_edited_time"):
+        return cached["properties"]
+    return None
+
+
+def put_properties(cache: dict, db: dict, properties: dict) -> None:
+    """
+    Store a database's properties keyed by its last_edited_time.
+
+    Args:
+        cache: Loaded schema cache
+        db: Database object from a search response
+        properties: Properties payload to cache
+    """
+    cache[db["id"]] = {
+        "last_edited_time": db.get("last_edited_time"),
+        "properties": properties,
+    }
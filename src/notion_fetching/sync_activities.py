@@ -12,13 +12,14 @@ Usage:
     python -m src.notion_fetching.sync_activities [--no-aggregate] [--full-sync]
 """
 
-import asyncio
 import argparse
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timezone
 from src.db.database import AsyncSessionLocal
 from src.services.activity_sync_service import ActivitySyncService
 from src.services.activity_stats_service import ActivityStatsService
-from src.core.logging import get_logger
+from src.core.logging import get_logger, timed
 
 logger = get_logger(__name__)
 
@@ -36,10 +37,11 @@ async def sync_and_aggregate(
         aggregate: Run daily aggregation after sync
         incremental: Only sync recent changes
     """
-    start_time = datetime.utcnow()
+    t0 = time.perf_counter_ns()
 
     logger.info(
         "sync_started",
+        started_at=datetime.now(timezone.utc).isoformat(),
         aggregate=aggregate,
         incremental=incremental
     )
@@ -48,9 +50,10 @@ async def sync_and_aggregate(
         try:
             # Sync activities
             sync_service = ActivitySyncService(session)
-            sync_result = await sync_service.sync_all(
-                incremental=incremental
-            )
+            with timed("sync", logger):
+                sync_result = await sync_service.sync_all(
+                    incremental=incremental
+                )
 
             logger.info("sync_completed", result=sync_result)
 
@@ -76,18 +79,17 @@ async def sync_and_aggregate(
 
                 stats_service = ActivityStatsService(session)
 
-                # Aggregate for today
-                from datetime import date
-                today = date.today()
-
-                count = await stats_service.bulk_aggregate_daily_activities(
-                    start_date=today, end_date=today
-                )
+                # Refresh only the (person, day) summaries this sync wrote to,
+                # instead of rescanning every person for a fixed date range
+                with timed("aggregate", logger):
+                    count = await stats_service.aggregate_person_days(
+                        sync_service.touched_days
+                    )
 
                 logger.info("aggregation_completed", summaries_created=count)
                 print(f"Summaries created/updated: {count}")
 
-            duration = (datetime.utcnow() - start_time).total_seconds()
+            duration = (time.perf_counter_ns() - t0) / 1e9
             print("\n" + "=" * 80)
             print(f"TOTAL DURATION: {duration:.2f}s")
             print("=" * 80 + "\n")
@@ -111,7 +113,7 @@ async def main():
     parser.add_argument(
         "--full-sync",
         action="store_true",
-        help="Perform full sync (not incremental)"
+        help="Perform full sync (ignore the last successful sync watermark)"
     )
 
     args = parser.parse_args()
@@ -123,4 +125,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional (no Windows wheels); fall back to the stock loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -9,7 +9,7 @@ Usage:
 """
 
 import asyncio
-from datetime import datetime
+import time
 from src.db.database import AsyncSessionLocal
 from src.repositories.person_repository import PersonRepository
 from src.core.config import Config
@@ -19,6 +19,54 @@ from notion_client import AsyncClient
 logger = get_logger(__name__)
 config = Config()
 
+# Candidate property names for each extracted field, in priority order
+NAME_KEYS = ("Name", "Имя", "Full Name", "Username", "Название")
+EMAIL_KEYS = ("Email", "Почта", "E-mail")
+TELEGRAM_KEYS = ("Telegram", "Telegram ID", "TG", "TG ID")
+NOTION_ID_KEYS = ("Notion ID", "User ID", "NotionID")
+
+
+def plain_text(blocks: list) -> str:
+    """Join rich text blocks into plain text; most values are a single block."""
+    if len(blocks) == 1:
+        return blocks[0]["plain_text"]
+    return "".join([t["plain_text"] for t in blocks])
+
+
+async def iter_user_pages(notion: AsyncClient, users_database_id: str):
+    """
+    Yield user pages of a database query, one API response at a time.
+
+    Notion cursors are sequential, so the request for the next cursor is
+    started as soon as a response arrives and runs while the caller writes
+    the current batch to the database.
+
+    Args:
+        notion: Notion client
+        users_database_id: Notion database ID for users
+
+    Yields:
+        List of page objects from each response
+    """
+    query_params = {"database_id": users_database_id, "page_size": 100}
+    next_fetch = asyncio.create_task(notion.databases.query(**query_params))
+
+    try:
+        while next_fetch is not None:
+            response = await next_fetch
+            next_fetch = None
+
+            next_cursor = response.get("next_cursor")
+            if response.get("has_more") and next_cursor:
+                next_fetch = asyncio.create_task(
+                    notion.databases.query(**query_params, start_cursor=next_cursor)
+                )
+
+            yield response.get("results", [])
+    finally:
+        if next_fetch is not None:
+            next_fetch.cancel()
+
 
 async def sync_users_from_notion(users_database_id: str):
     """
@@ -30,7 +78,7 @@ async def sync_users_from_notion(users_database_id: str):
     Returns:
         Sync statistics
     """
-    start_time = datetime.utcnow()
+    t0 = time.perf_counter_ns()
     stats = {
         "users_processed": 0,
         "users_created": 0,
@@ -46,93 +94,89 @@ async def sync_users_from_notion(users_database_id: str):
             notion = AsyncClient(auth=config.NOTION_API_KEY)
             person_repo = PersonRepository(session)
             
-            # Query Notion users database
-            has_more = True
-            start_cursor = None
-            all_users = []
-            
+            # Query Notion users database, writing each batch while the next one is fetched
+            fetched = 0
+
             print(f"\n🔄 Fetching users from Notion database: {users_database_id}")
-            
-            while has_more:
-                query_params = {
-                    "database_id": users_database_id,
-                    "page_size": 100
-                }
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-                
-                response = await notion.databases.query(**query_params)
-                all_users.extend(response.get("results", []))
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
-            
-            logger.info("users_fetched_from_notion", count=len(all_users))
-            print(f"✅ Fetched {len(all_users)} users from Notion\n")
-            
-            # Process each user
-            for user_page in all_users:
+
+            async for batch in iter_user_pages(notion, users_database_id):
+                fetched += len(batch)
+
+                # Extract each user, then write the whole batch in one upsert
+                rows = []
+                for user_page in batch:
+                    try:
+                        page_id = user_page["id"]
+                        properties = user_page.get("properties", {})
+
+                        # Extract user data
+                        username = extract_name(properties)
+                        email = extract_email(properties)
+                        telegram_id = extract_telegram_id(properties)
+                        notion_user_id = extract_notion_user_id(properties)
+
+                        # Use page creator as notion_id if not specified
+                        avatar_url = None
+                        if not notion_user_id:
+                            created_by = user_page.get("created_by", {})
+                            notion_user_id = created_by.get("id")
+                            avatar_url = created_by.get("avatar_url")
+
+                        if not notion_user_id:
+                            logger.warning("user_no_notion_id", page_id=page_id)
+                            stats["errors"].append(f"No Notion ID for page {page_id}")
+                            continue
+
+                        rows.append({
+                            "notion_id": notion_user_id,
+                            "username": username or "Unknown User",
+                            "avatar_url": avatar_url,
+                            "email": email,
+                            "telegram_id": telegram_id or None
+                        })
+
+                    except Exception as e:
+                        error_msg = f"Error processing user {user_page.get('id')}: {str(e)}"
+                        logger.error("user_processing_error", error=error_msg)
+                        stats["errors"].append(error_msg)
+                        print(f"❌ Error: {error_msg}")
+
+                if not rows:
+                    continue
+
                 try:
-                    page_id = user_page["id"]
-                    properties = user_page.get("properties", {})
-                    
-                    # Extract user data
-                    username = extract_name(properties)
-                    email = extract_email(properties)
-                    telegram_id = extract_telegram_id(properties)
-                    notion_user_id = extract_notion_user_id(properties)
-                    
-                    # Use page creator as notion_id if not specified
-                    avatar_url = None
-                    if not notion_user_id:
-                        created_by = user_page.get("created_by", {})
-                        notion_user_id = created_by.get("id")
-                        avatar_url = created_by.get("avatar_url")
-                    
-                    if not notion_user_id:
-                        logger.warning("user_no_notion_id", page_id=page_id)
-                        stats["errors"].append(f"No Notion ID for page {page_id}")
-                        continue
-                    
-                    # Get or create person
-                    person, created = await person_repo.get_or_create_by_notion_id(
-                        notion_id=notion_user_id,
-                        username=username or "Unknown User",
-                        avatar_url=avatar_url,
-                        email=email
-                    )
-                    
-                    # Update telegram_id if provided and different
-                    if telegram_id and person.telegram_id != telegram_id:
-                        await person_repo.update(
-                            person_id=person.id,
-                            telegram_id=telegram_id
-                        )
-                    
+                    # Savepoint so a failing batch doesn't abort the rest of the sync
+                    async with session.begin_nested():
+                        upserted = await person_repo.bulk_upsert(rows)
+                except Exception as e:
+                    error_msg = f"Error upserting {len(rows)} users: {str(e)}"
+                    logger.error("user_processing_error", error=error_msg)
+                    stats["errors"].append(error_msg)
+                    print(f"❌ Error: {error_msg}")
+                    continue
+
+                created_by_notion_id = {notion_id: created for _, notion_id, created in upserted}
+                for row in rows:
+                    # A user repeated within the batch counts as created only once
+                    created = created_by_notion_id[row["notion_id"]]
+                    created_by_notion_id[row["notion_id"]] = False
                     stats["users_processed"] += 1
                     if created:
                         stats["users_created"] += 1
-                        print(f"✨ Created: {username} ({email or 'no email'})")
+                        print(f"✨ Created: {row['username']} ({row['email'] or 'no email'})")
                     else:
                         stats["users_updated"] += 1
-                        print(f"🔄 Updated: {username} ({email or 'no email'})")
-                    
-                    logger.info(
-                        "user_synced",
-                        person_id=person.id,
-                        notion_id=notion_user_id,
-                        created=created
-                    )
-                    
-                except Exception as e:
-                    error_msg = f"Error processing user {user_page.get('id')}: {str(e)}"
-                    logger.error("user_processing_error", error=error_msg)
-                    stats["errors"].append(error_msg)
-                    print(f"❌ Error: {error_msg}")
-            
+                        print(f"🔄 Updated: {row['username']} ({row['email'] or 'no email'})")
+
+                logger.info("users_synced", count=len(upserted))
+
+            logger.info("users_fetched_from_notion", count=fetched)
+            print(f"\n✅ Fetched {fetched} users from Notion")
+
             # Commit all changes
             await session.commit()
             
-            duration = (datetime.utcnow() - start_time).total_seconds()
+            duration = (time.perf_counter_ns() - t0) / 1e9
             logger.info("sync_users_completed", stats=stats, duration=duration)
             
             # Print summary
@@ -163,74 +207,78 @@ async def sync_users_from_notion(users_database_id: str):
 def extract_name(properties: dict) -> str:
     """Extract user name from Notion properties."""
     # Try common name property names
-    for prop_name in ["Name", "Имя", "Full Name", "Username", "Название"]:
-        if prop_name in properties:
-            prop = properties[prop_name]
-            
-            # Title property
-            if prop.get("title"):
-                return "".join([t["plain_text"] for t in prop["title"]])
-            
-            # Rich text property
-            if prop.get("rich_text"):
-                return "".join([t["plain_text"] for t in prop["rich_text"]])
-    
+    for key in NAME_KEYS:
+        prop = properties.get(key)
+        if not prop:
+            continue
+
+        # Title property
+        if prop.get("title"):
+            return plain_text(prop["title"])
+
+        # Rich text property
+        if prop.get("rich_text"):
+            return plain_text(prop["rich_text"])
+
     return "Unknown User"
 
 
 def extract_email(properties: dict) -> str | None:
     """Extract email from Notion properties."""
-    for prop_name in ["Email", "Почта", "E-mail"]:
-        if prop_name in properties:
-            prop = properties[prop_name]
-            
-            # Email property type
-            if prop.get("email"):
-                return prop["email"]
-            
-            # Rich text or title
-            if prop.get("rich_text"):
-                text = "".join([t["plain_text"] for t in prop["rich_text"]])
-                if "@" in text:
-                    return text.strip()
-            
-            if prop.get("title"):
-                text = "".join([t["plain_text"] for t in prop["title"]])
-                if "@" in text:
-                    return text.strip()
-    
+    for key in EMAIL_KEYS:
+        prop = properties.get(key)
+        if not prop:
+            continue
+
+        # Email property type
+        if prop.get("email"):
+            return prop["email"]
+
+        # Rich text or title
+        if prop.get("rich_text"):
+            text = plain_text(prop["rich_text"])
+            if "@" in text:
+                return text.strip()
+
+        if prop.get("title"):
+            text = plain_text(prop["title"])
+            if "@" in text:
+                return text.strip()
+
     return None
 
 
 def extract_telegram_id(properties: dict) -> str | None:
     """Extract Telegram ID from Notion properties."""
-    for prop_name in ["Telegram", "Telegram ID", "TG", "TG ID"]:
-        if prop_name in properties:
-            prop = properties[prop_name]
-            
-            if prop.get("rich_text"):
-                return "".join([t["plain_text"] for t in prop["rich_text"]])
-            
-            if prop.get("title"):
-                return "".join([t["plain_text"] for t in prop["title"]])
-    
+    for key in TELEGRAM_KEYS:
+        prop = properties.get(key)
+        if not prop:
+            continue
+
+        if prop.get("rich_text"):
+            return plain_text(prop["rich_text"])
+
+        if prop.get("title"):
+            return plain_text(prop["title"])
+
     return None
 
 
 def extract_notion_user_id(properties: dict) -> str | None:
     """Extract Notion User ID from Notion properties (if stored in a property)."""
-    for prop_name in ["Notion ID", "User ID", "NotionID"]:
-        if prop_name in properties:
-            prop = properties[prop_name]
-            
-            # People property
-            if prop.get("people") and len(prop["people"]) > 0:
-                return prop["people"][0].get("id")
-            
-            # Rich text
-            if prop.get("rich_text"):
-                return "".join([t["plain_text"] for t in prop["rich_text"]])
-    
+    for key in NOTION_ID_KEYS:
+        prop = properties.get(key)
+        if not prop:
+            continue
+
+        # People property
+        if prop.get("people") and len(prop["people"]) > 0:
+            return prop["people"][0].get("id")
+
+        # Rich text
+        if prop.get("rich_text"):
+            return plain_text(prop["rich_text"])
+
     return None
 
 
@@ -248,5 +296,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional (no Windows wheels); fall back to the stock loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
@@ -0,0 +1,11 @@
+"""
+Shared helpers for the repositories' INSERT ... ON CONFLICT upserts.
+"""
+
+from sqlalchemy import Boolean, literal_column
+
+# RETURNING expression that is true for rows the upsert inserted rather than updated
+INSERTED = literal_column("xmax = 0", Boolean)
+
+# Rows per upsert statement; bounds statement size and server memory on large syncs
+UPSERT_BATCH_SIZE = 1000
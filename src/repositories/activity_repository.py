@@ -5,19 +5,32 @@ This repository handles CRUD operations for activity tracking entities.
 """
 
 from datetime import datetime, date, timedelta, timezone
-from typing import Optional, List, Dict
-from sqlalchemy import select, func, and_, or_, desc, case
+from typing import Optional, List, Dict, Iterable, Tuple
+from sqlalchemy import select, func, and_, or_, desc, case, cast, union_all, Date, Integer, literal, text, table, column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.person import (
     ConversationActivity,
     TaskActivity,
     ActivitySummary,
+    ActivitySyncState,
     Person
 )
 from src.core.logging import get_logger
+from src.repositories._upsert import INSERTED, UPSERT_BATCH_SIZE
 
 logger = get_logger(__name__)
 
+# Materialized view of per-person monthly totals (see the add_leaderboard_monthly_view migration)
+leaderboard_monthly = table(
+    "leaderboard_monthly",
+    column("month", Date),
+    column("person_id", Integer),
+    column("score", Integer),
+    column("convs", Integer),
+    column("tasks", Integer)
+)
+
 
 class ActivityRepository:
     """Repository for Activity-related database operations."""
@@ -25,6 +38,23 @@ class ActivityRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def _execute_in_batches(self, stmt, rows: List[dict]) -> int:
+        """
+        Execute an upsert over rows in chunks of UPSERT_BATCH_SIZE.
+
+        Args:
+            stmt: Upsert statement ending in ``.returning(INSERTED)``
+            rows: Parameter dicts, one per row
+
+        Returns:
+            Number of rows that were inserted rather than updated
+        """
+        inserted = 0
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            result = await self.session.execute(stmt, rows[i:i + UPSERT_BATCH_SIZE])
+            inserted += sum(1 for flag in result.scalars() if flag)
+        return inserted
+
     # ==================== Conversation Activity ====================
 
     async def create_conversation_activity(
@@ -46,7 +76,6 @@ class ActivityRepository:
 
         self.session.add(activity)
         await self.session.flush()
-        await self.session.refresh(activity)
 
         logger.info(
             "conversation_activity_created",
@@ -79,50 +108,44 @@ class ActivityRepository:
         )
         return result.scalar_one_or_none()
 
-    async def bulk_create_conversations(
-        self, conversations: List[dict]
-    ) -> List[ConversationActivity]:
-        """Bulk create conversation activities (idempotent).
-        
+    async def bulk_create_conversations(self, conversations: List[dict]) -> int:
+        """Bulk upsert conversation activities (idempotent).
+
         Creates one activity per attendee per conversation.
-        Uses composite unique constraint (notion_conversation_id, person_id).
+        Uses composite unique constraint (notion_conversation_id, person_id)
+        and resolves conflicts server-side with INSERT ... ON CONFLICT DO UPDATE.
+
+        Returns:
+            Number of newly inserted activities
         """
-        created = []
-        updated = []
-        
-        for conv in conversations:
-            existing = await self.get_conversation_by_notion_id_and_person(
-                conv["notion_conversation_id"],
-                conv["person_id"]
-            )
-            if not existing:
-                activity = await self.create_conversation_activity(**conv)
-                created.append(activity)
-            else:
-                # Update fields if changed or missing
-                updated_fields = False
-                
-                if conv.get("conversation_title") and existing.conversation_title != conv["conversation_title"]:
-                    existing.conversation_title = conv["conversation_title"]
-                    updated_fields = True
-                
-                if conv.get("notion_metadata") and not existing.notion_metadata:
-                    existing.notion_metadata = conv["notion_metadata"]
-                    updated_fields = True
-                
-                if conv.get("created_at") and existing.created_at != conv["created_at"]:
-                    existing.created_at = conv["created_at"]
-                    updated_fields = True
-                
-                # Always update last_synced_at
-                existing.last_synced_at = datetime.utcnow()
-                
-                if updated_fields:
-                    updated.append(existing)
-                
-                await self.session.flush()
-
-        logger.info("bulk_conversations_created", count=len(created), updated=len(updated))
+        # One row per conflict key: Postgres rejects a statement that hits the same row twice
+        rows = list({
+            (c["notion_conversation_id"], c["person_id"]): c for c in conversations
+        }.values())
+        if not rows:
+            logger.info("bulk_conversations_created", count=0, updated=0)
+            return 0
+
+        stmt = pg_insert(ConversationActivity)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                ConversationActivity.notion_conversation_id,
+                ConversationActivity.person_id
+            ],
+            set_={
+                "conversation_title": func.coalesce(
+                    stmt.excluded.conversation_title, ConversationActivity.conversation_title
+                ),
+                "notion_metadata": func.coalesce(
+                    ConversationActivity.notion_metadata, stmt.excluded.notion_metadata
+                ),
+                "created_at": stmt.excluded.created_at,
+                "last_synced_at": func.now()
+            }
+        ).returning(INSERTED)
+        created = await self._execute_in_batches(stmt, rows)
+
+        logger.info("bulk_conversations_created", count=created, updated=len(rows) - created)
         return created
 
     # ==================== Task Activity ====================
@@ -150,7 +173,6 @@ class ActivityRepository:
 
         self.session.add(activity)
         await self.session.flush()
-        await self.session.refresh(activity)
 
         logger.info(
             "task_activity_created",
@@ -167,49 +189,39 @@ class ActivityRepository:
         )
         return result.scalar_one_or_none()
 
-    async def bulk_create_tasks(self, tasks: List[dict]) -> List[TaskActivity]:
-        """Bulk create task activities (idempotent)."""
-        created = []
-        updated = []
-        
-        for task in tasks:
-            existing = await self.get_task_by_notion_id(task["notion_task_id"])
-            if not existing:
-                activity = await self.create_task_activity(**task)
-                created.append(activity)
-            else:
-                # Update fields if changed or missing
-                updated_fields = False
-                
-                if task.get("task_title") and existing.task_title != task["task_title"]:
-                    existing.task_title = task["task_title"]
-                    updated_fields = True
-                
-                if task.get("project_name") != existing.project_name:
-                    existing.project_name = task.get("project_name")
-                    updated_fields = True
-                
-                if task.get("notion_metadata") and not existing.notion_metadata:
-                    existing.notion_metadata = task["notion_metadata"]
-                    updated_fields = True
-                
-                if task.get("completed_at") and existing.completed_at != task["completed_at"]:
-                    existing.completed_at = task["completed_at"]
-                    updated_fields = True
-                
-                if task.get("last_status_change") and existing.last_status_change != task["last_status_change"]:
-                    existing.last_status_change = task["last_status_change"]
-                    updated_fields = True
-                
-                # Always update last_synced_at
-                existing.last_synced_at = datetime.utcnow()
-                
-                if updated_fields:
-                    updated.append(existing)
-                
-                await self.session.flush()
-
-        logger.info("bulk_tasks_created", count=len(created), updated=len(updated))
+    async def bulk_create_tasks(self, tasks: List[dict]) -> int:
+        """Bulk upsert task activities (idempotent).
+
+        Conflicts on notion_task_id are resolved server-side with
+        INSERT ... ON CONFLICT DO UPDATE.
+
+        Returns:
+            Number of newly inserted activities
+        """
+        rows = list({t["notion_task_id"]: t for t in tasks}.values())
+        if not rows:
+            logger.info("bulk_tasks_created", count=0, updated=0)
+            return 0
+
+        stmt = pg_insert(TaskActivity)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskActivity.notion_task_id],
+            set_={
+                "task_title": func.coalesce(stmt.excluded.task_title, TaskActivity.task_title),
+                "project_name": stmt.excluded.project_name,
+                "notion_metadata": func.coalesce(
+                    TaskActivity.notion_metadata, stmt.excluded.notion_metadata
+                ),
+                "completed_at": stmt.excluded.completed_at,
+                "last_status_change": func.coalesce(
+                    stmt.excluded.last_status_change, TaskActivity.last_status_change
+                ),
+                "last_synced_at": func.now()
+            }
+        ).returning(INSERTED)
+        created = await self._execute_in_batches(stmt, rows)
+
+        logger.info("bulk_tasks_created", count=created, updated=len(rows) - created)
         return created
 
     # ==================== Activity Queries ====================
@@ -227,58 +239,71 @@ class ActivityRepository:
         Get all activities for a person with filtering and pagination.
 
         Returns a combined list of conversations and tasks sorted by time.
+        Both tables are combined with UNION ALL so sorting, pagination and
+        the total count happen in the database.
         """
-        activities = []
+        selects = []
 
-        # Fetch conversations
+        # Conversations
         if not activity_type or activity_type in ("conversation", "all"):
-            conv_query = select(ConversationActivity).where(
-                ConversationActivity.person_id == person_id
-            )
+            conv_query = select(
+                ConversationActivity.id.label("id"),
+                literal("conversation").label("activity_type"),
+                func.coalesce(
+                    ConversationActivity.conversation_title, "Untitled Conversation"
+                ).label("title"),
+                ConversationActivity.created_at.label("occurred_at"),
+                ConversationActivity.person_id.label("person_id"),
+                ConversationActivity.notion_metadata.label("metadata")
+            ).where(ConversationActivity.person_id == person_id)
             if start_date:
                 conv_query = conv_query.where(ConversationActivity.created_at >= start_date)
             if end_date:
                 conv_query = conv_query.where(ConversationActivity.created_at <= end_date)
+            selects.append(conv_query)
 
-            conv_result = await self.session.execute(conv_query)
-            conversations = conv_result.scalars().all()
-
-            for conv in conversations:
-                activities.append({
-                    "id": conv.id,
-                    "activity_type": "conversation",
-                    "title": conv.conversation_title or "Untitled Conversation",
-                    "occurred_at": conv.created_at,
-                    "person_id": conv.person_id,
-                    "metadata": conv.metadata
-                })
-
-        # Fetch tasks
+        # Tasks
         if not activity_type or activity_type in ("task", "all"):
-            task_query = select(TaskActivity).where(TaskActivity.person_id == person_id)
+            task_query = select(
+                TaskActivity.id.label("id"),
+                literal("task").label("activity_type"),
+                func.coalesce(TaskActivity.task_title, "Untitled Task").label("title"),
+                TaskActivity.completed_at.label("occurred_at"),
+                TaskActivity.person_id.label("person_id"),
+                TaskActivity.notion_metadata.label("metadata")
+            ).where(TaskActivity.person_id == person_id)
             if start_date:
                 task_query = task_query.where(TaskActivity.completed_at >= start_date)
             if end_date:
                 task_query = task_query.where(TaskActivity.completed_at <= end_date)
+            selects.append(task_query)
 
-            task_result = await self.session.execute(task_query)
-            tasks = task_result.scalars().all()
-
-            for task in tasks:
-                activities.append({
-                    "id": task.id,
-                    "activity_type": "task",
-                    "title": task.task_title or "Untitled Task",
-                    "occurred_at": task.completed_at,
-                    "person_id": task.person_id,
-                    "metadata": task.metadata
-                })
+        if not selects:
+            return [], 0
 
-        # Sort by time (most recent first)
-        activities.sort(key=lambda x: x["occurred_at"], reverse=True)
+        activities = union_all(*selects).subquery()
 
-        total = len(activities)
-        paginated = activities[skip : skip + limit]
+        # Sort by time (most recent first); COUNT(*) OVER () carries the
+        # unpaginated total on every returned row, saving a separate count query
+        result = await self.session.execute(
+            select(activities, func.count().over().label("total"))
+            .order_by(desc(activities.c.occurred_at), activities.c.activity_type, activities.c.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        paginated = [dict(row) for row in result.mappings()]
+
+        if paginated:
+            total = paginated[0]["total"]
+            for activity in paginated:
+                del activity["total"]
+        elif skip:
+            # Page past the end: no row to read the total from
+            total = (
+                await self.session.execute(select(func.count()).select_from(activities))
+            ).scalar_one()
+        else:
+            total = 0
 
         return paginated, total
 
@@ -287,44 +312,33 @@ class ActivityRepository:
     async def create_or_update_summary(
         self,
         person_id: int,
-        date: datetime,
+        date: date,
         conversations_created: int = 0,
         tasks_completed: int = 0,
         total_activity_score: int = 0
     ) -> ActivitySummary:
-        """Create or update daily activity summary."""
-        # Try to get existing summary using date-only comparison to handle timezone differences
-        result = await self.session.execute(
-            select(ActivitySummary).where(
-                and_(
-                    ActivitySummary.person_id == person_id,
-                    func.date(ActivitySummary.date) == date.date()
-                )
-            )
+        """Create or update daily activity summary with a single upsert."""
+        stmt = pg_insert(ActivitySummary).values(
+            person_id=person_id,
+            date=date,
+            conversations_created=conversations_created,
+            tasks_completed=tasks_completed,
+            total_activity_score=total_activity_score
         )
-        summary = result.scalar_one_or_none()
-
-        if summary:
-            # Update existing (also update the date to ensure it's timezone-aware)
-            summary.date = date
-            summary.conversations_created = conversations_created
-            summary.tasks_completed = tasks_completed
-            summary.total_activity_score = total_activity_score
-        else:
-            # Create new
-            summary = ActivitySummary(
-                person_id=person_id,
-                date=date,
-                conversations_created=conversations_created,
-                tasks_completed=tasks_completed,
-                total_activity_score=total_activity_score
-            )
-            self.session.add(summary)
-
-        await self.session.flush()
-        await self.session.refresh(summary)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivitySummary.person_id, ActivitySummary.date],
+            set_={
+                "conversations_created": stmt.excluded.conversations_created,
+                "tasks_completed": stmt.excluded.tasks_completed,
+                "total_activity_score": stmt.excluded.total_activity_score,
+                "updated_at": func.now()
+            }
+        ).returning(ActivitySummary)
 
-        return summary
+        result = await self.session.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return result.scalar_one()
 
     async def get_summaries_for_person(
         self,
@@ -346,55 +360,367 @@ class ActivityRepository:
         )
         return list(result.scalars().all())
 
+    async def get_person_stats_with_totals(
+        self,
+        person_id: int,
+        start_date: date,
+        end_date: date
+    ) -> Tuple[Dict[str, int], List]:
+        """
+        Get a person's daily summaries in a date range together with their totals.
+
+        Totals are computed in the same query as window sums over the range,
+        so no second pass over the rows is needed.
+
+        Args:
+            person_id: Person ID
+            start_date: Start date
+            end_date: End date (inclusive)
+
+        Returns:
+            Tuple of (totals dict with conversations_created, tasks_completed
+            and total_activity_score, daily rows in date order)
+        """
+        window = {"partition_by": ActivitySummary.person_id}
+        result = await self.session.execute(
+            select(
+                ActivitySummary.date,
+                ActivitySummary.conversations_created,
+                ActivitySummary.tasks_completed,
+                ActivitySummary.total_activity_score,
+                func.sum(ActivitySummary.conversations_created).over(**window).label("sum_conversations"),
+                func.sum(ActivitySummary.tasks_completed).over(**window).label("sum_tasks"),
+                func.sum(ActivitySummary.total_activity_score).over(**window).label("sum_score")
+            )
+            .where(
+                and_(
+                    ActivitySummary.person_id == person_id,
+                    ActivitySummary.date >= start_date,
+                    ActivitySummary.date <= end_date
+                )
+            )
+            .order_by(ActivitySummary.date)
+        )
+        rows = result.all()
+
+        first = rows[0] if rows else None
+        totals = {
+            "conversations_created": int(first.sum_conversations) if first else 0,
+            "tasks_completed": int(first.sum_tasks) if first else 0,
+            "total_activity_score": int(first.sum_score) if first else 0
+        }
+        return totals, rows
+
+    async def get_heatmap_rows(
+        self, person_id: int, start_date: date, end_date: date
+    ) -> List[Tuple[date, Optional[int]]]:
+        """
+        Get one row per day in a range with that day's activity score.
+
+        The day spine comes from generate_series, left-joined to the person's
+        summaries on their date, so days without a summary are
+        returned with a None score.
+
+        Args:
+            person_id: Person ID
+            start_date: First day
+            end_date: Last day (inclusive)
+
+        Returns:
+            List of (day, total_activity_score or None) in date order
+        """
+        offsets = select(
+            func.generate_series(0, (end_date - start_date).days).label("offset")
+        ).subquery("offsets")
+        day = literal(start_date, Date) + offsets.c.offset
+
+        result = await self.session.execute(
+            select(day, ActivitySummary.total_activity_score)
+            .select_from(offsets)
+            .outerjoin(
+                ActivitySummary,
+                and_(
+                    ActivitySummary.person_id == person_id,
+                    ActivitySummary.date == day
+                )
+            )
+            .order_by(offsets.c.offset)
+        )
+        return [tuple(row) for row in result.all()]
+
     async def aggregate_daily_activities(
         self, person_id: int, target_date: date
     ) -> ActivitySummary:
         """
         Aggregate activities for a person on a specific date.
 
-        Calculates counts from conversation and task activities.
+        Calculates counts from conversation and task activities and writes
+        the summary in one INSERT ... SELECT ... ON CONFLICT DO UPDATE.
         """
         # Use UTC timezone-aware datetimes to match database timestamps (from Notion sync)
         start_datetime = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=timezone.utc)
         end_datetime = datetime.combine(target_date, datetime.max.time()).replace(tzinfo=timezone.utc)
 
-        # Count conversations
-        conv_result = await self.session.execute(
-            select(func.count(ConversationActivity.id)).where(
+        conv_count = select(func.count(ConversationActivity.id)).where(
+            and_(
+                ConversationActivity.person_id == person_id,
+                ConversationActivity.created_at >= start_datetime,
+                ConversationActivity.created_at <= end_datetime
+            )
+        ).scalar_subquery()
+        task_count = select(func.count(TaskActivity.id)).where(
+            and_(
+                TaskActivity.person_id == person_id,
+                TaskActivity.completed_at >= start_datetime,
+                TaskActivity.completed_at <= end_datetime
+            )
+        ).scalar_subquery()
+        counts = select(
+            conv_count.label("conversations"), task_count.label("tasks")
+        ).subquery("counts")
+
+        summary = select(
+            literal(person_id, Integer),
+            literal(target_date, Date),
+            counts.c.conversations,
+            counts.c.tasks,
+            # Conversations worth 1 point, tasks worth 2 points
+            counts.c.conversations + counts.c.tasks * 2
+        )
+
+        stmt = pg_insert(ActivitySummary).from_select(
+            ["person_id", "date", "conversations_created", "tasks_completed", "total_activity_score"],
+            summary
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivitySummary.person_id, ActivitySummary.date],
+            set_={
+                "conversations_created": stmt.excluded.conversations_created,
+                "tasks_completed": stmt.excluded.tasks_completed,
+                "total_activity_score": stmt.excluded.total_activity_score,
+                "updated_at": func.now()
+            }
+        ).returning(ActivitySummary)
+
+        result = await self.session.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        return result.scalar_one()
+
+    def _daily_count_queries(
+        self,
+        start_date: date,
+        end_date: date,
+        person_ids: Optional[List[int]] = None
+    ):
+        """Build the grouped (person_id, day, count) queries for conversations and tasks."""
+        start_datetime = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+        end_datetime = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
+
+        conv_day = cast(func.timezone("UTC", ConversationActivity.created_at), Date)
+        conv_query = (
+            select(
+                ConversationActivity.person_id.label("person_id"),
+                conv_day.label("day"),
+                func.count(ConversationActivity.id).label("count")
+            )
+            .where(
                 and_(
-                    ConversationActivity.person_id == person_id,
                     ConversationActivity.created_at >= start_datetime,
                     ConversationActivity.created_at <= end_datetime
                 )
             )
+            .group_by(ConversationActivity.person_id, conv_day)
         )
-        conversations_count = conv_result.scalar_one()
+        if person_ids is not None:
+            conv_query = conv_query.where(ConversationActivity.person_id.in_(person_ids))
 
-        # Count tasks
-        task_result = await self.session.execute(
-            select(func.count(TaskActivity.id)).where(
+        task_day = cast(func.timezone("UTC", TaskActivity.completed_at), Date)
+        task_query = (
+            select(
+                TaskActivity.person_id.label("person_id"),
+                task_day.label("day"),
+                func.count(TaskActivity.id).label("count")
+            )
+            .where(
                 and_(
-                    TaskActivity.person_id == person_id,
                     TaskActivity.completed_at >= start_datetime,
                     TaskActivity.completed_at <= end_datetime
                 )
             )
+            .group_by(TaskActivity.person_id, task_day)
         )
-        tasks_count = task_result.scalar_one()
+        if person_ids is not None:
+            task_query = task_query.where(TaskActivity.person_id.in_(person_ids))
 
-        # Calculate activity score (conversations worth 1 point, tasks worth 2 points)
-        total_score = conversations_count + (tasks_count * 2)
+        return conv_query, task_query
 
-        # Create or update summary
-        summary = await self.create_or_update_summary(
-            person_id=person_id,
-            date=start_datetime,
-            conversations_created=conversations_count,
-            tasks_completed=tasks_count,
-            total_activity_score=total_score
+    async def _count_activities_by_day(
+        self,
+        start_date: date,
+        end_date: date,
+        person_ids: Optional[List[int]] = None
+    ) -> Tuple[Dict[Tuple[int, date], int], Dict[Tuple[int, date], int]]:
+        """Count conversations and tasks per (person, UTC day) with two grouped queries."""
+        conv_query, task_query = self._daily_count_queries(start_date, end_date, person_ids)
+
+        conv_result = await self.session.execute(conv_query)
+        conversation_counts = {(person_id, day): count for person_id, day, count in conv_result.all()}
+
+        task_result = await self.session.execute(task_query)
+        task_counts = {(person_id, day): count for person_id, day, count in task_result.all()}
+
+        return conversation_counts, task_counts
+
+    async def _upsert_summaries(
+        self,
+        keys: Iterable[Tuple[int, date]],
+        conversation_counts: Dict[Tuple[int, date], int],
+        task_counts: Dict[Tuple[int, date], int]
+    ) -> int:
+        """Write one summary per (person, day) key in a single batched upsert."""
+        rows = []
+        for person_id, day in keys:
+            conversations_count = conversation_counts.get((person_id, day), 0)
+            tasks_count = task_counts.get((person_id, day), 0)
+            rows.append({
+                "person_id": person_id,
+                "date": day,
+                "conversations_created": conversations_count,
+                "tasks_completed": tasks_count,
+                # Conversations worth 1 point, tasks worth 2 points
+                "total_activity_score": conversations_count + (tasks_count * 2)
+            })
+
+        if not rows:
+            return 0
+
+        stmt = pg_insert(ActivitySummary)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivitySummary.person_id, ActivitySummary.date],
+            set_={
+                "conversations_created": stmt.excluded.conversations_created,
+                "tasks_completed": stmt.excluded.tasks_completed,
+                "total_activity_score": stmt.excluded.total_activity_score,
+                "updated_at": func.now()
+            }
+        ).returning(INSERTED)
+        await self._execute_in_batches(stmt, rows)
+
+        return len(rows)
+
+    async def bulk_aggregate_daily_activities(
+        self, start_date: date, end_date: date
+    ) -> int:
+        """
+        Aggregate daily summaries for all persons over a date range.
+
+        Runs as one INSERT ... SELECT ... ON CONFLICT DO UPDATE: every
+        (person, UTC day) pair in the range is joined to the grouped
+        conversation and task counts and written server-side, including
+        zero-activity days.
+
+        Args:
+            start_date: First day to aggregate
+            end_date: Last day to aggregate (inclusive)
+
+        Returns:
+            Number of summaries created/updated
+        """
+        conv_query, task_query = self._daily_count_queries(start_date, end_date)
+        conv_counts = conv_query.subquery("conv_counts")
+        task_counts = task_query.subquery("task_counts")
+
+        offsets = select(
+            func.generate_series(0, (end_date - start_date).days).label("offset")
+        ).subquery("offsets")
+        day = literal(start_date, Date) + offsets.c.offset
+
+        conversations_count = func.coalesce(conv_counts.c.count, 0)
+        tasks_count = func.coalesce(task_counts.c.count, 0)
+        summaries = (
+            select(
+                Person.id,
+                day,
+                conversations_count,
+                tasks_count,
+                # Conversations worth 1 point, tasks worth 2 points
+                conversations_count + tasks_count * 2
+            )
+            .select_from(Person)
+            .join(offsets, literal(True))
+            .outerjoin(conv_counts, and_(conv_counts.c.person_id == Person.id, conv_counts.c.day == day))
+            .outerjoin(task_counts, and_(task_counts.c.person_id == Person.id, task_counts.c.day == day))
+        )
+
+        stmt = pg_insert(ActivitySummary).from_select(
+            ["person_id", "date", "conversations_created", "tasks_completed", "total_activity_score"],
+            summaries
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivitySummary.person_id, ActivitySummary.date],
+            set_={
+                "conversations_created": stmt.excluded.conversations_created,
+                "tasks_completed": stmt.excluded.tasks_completed,
+                "total_activity_score": stmt.excluded.total_activity_score,
+                "updated_at": func.now()
+            }
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def aggregate_range_activities(
+        self, person_id: int, start_date: date, end_date: date
+    ) -> int:
+        """
+        Aggregate daily summaries for one person over a date range.
+
+        Replaces calling aggregate_daily_activities once per day: all days are
+        counted with two grouped queries and written in one batched upsert.
+
+        Args:
+            person_id: Person ID
+            start_date: First day to aggregate
+            end_date: Last day to aggregate (inclusive)
+
+        Returns:
+            Number of summaries created/updated
+        """
+        conversation_counts, task_counts = await self._count_activities_by_day(
+            start_date, end_date, person_ids=[person_id]
         )
 
-        return summary
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        keys = [(person_id, day) for day in days]
+
+        return await self._upsert_summaries(keys, conversation_counts, task_counts)
+
+    async def aggregate_person_days(
+        self, keys: Iterable[Tuple[int, date]]
+    ) -> int:
+        """
+        Recalculate daily summaries for specific (person, day) pairs only.
+
+        Used after a sync to refresh just the days that received activities.
+        Counts are recomputed rather than incremented, so re-syncing the same
+        Notion pages never double-counts.
+
+        Args:
+            keys: (person_id, UTC day) pairs to refresh
+
+        Returns:
+            Number of summaries created/updated
+        """
+        keys = set(keys)
+        if not keys:
+            return 0
+
+        days = [day for _, day in keys]
+        conversation_counts, task_counts = await self._count_activities_by_day(
+            min(days), max(days), person_ids=list({person_id for person_id, _ in keys})
+        )
+
+        return await self._upsert_summaries(sorted(keys), conversation_counts, task_counts)
 
     async def get_leaderboard(
         self,
@@ -405,29 +731,119 @@ class ActivityRepository:
         """
         Get leaderboard for a date range.
 
-        Returns top performers sorted by total activity score.
+        Returns top performers sorted by total activity score. Summaries
+        are aggregated per person_id and cut to the top ``limit`` first, so
+        usernames are only joined for the rows that are returned.
         """
-        result = await self.session.execute(
+        totals = (
             select(
-                Person.id,
-                Person.username,
+                ActivitySummary.person_id,
                 func.sum(ActivitySummary.conversations_created).label("total_conversations"),
                 func.sum(ActivitySummary.tasks_completed).label("total_tasks"),
                 func.sum(ActivitySummary.total_activity_score).label("total_score")
             )
-            .join(Person, ActivitySummary.person_id == Person.id)
-            .where(
-                and_(
-                    ActivitySummary.date >= start_date,
-                    ActivitySummary.date <= end_date
-                )
+            .where(ActivitySummary.date.between(start_date, end_date))
+            .group_by(ActivitySummary.person_id)
+            .order_by(desc("total_score"), ActivitySummary.person_id)
+            .limit(limit)
+            .subquery()
+        )
+
+        result = await self.session.execute(
+            select(
+                Person.id,
+                Person.username,
+                totals.c.total_conversations,
+                totals.c.total_tasks,
+                totals.c.total_score
             )
-            .group_by(Person.id, Person.username)
-            .order_by(desc("total_score"))
+            .join(totals, totals.c.person_id == Person.id)
+            .order_by(totals.c.total_score.desc(), Person.id)
+        )
+
+        return self._rank_leaderboard(result.all())
+
+    async def get_monthly_leaderboard(
+        self,
+        start_month: date,
+        end_date: date,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        Get leaderboard from the first of a month up to a day.
+
+        Months before end_date's month are read from the precomputed
+        leaderboard_monthly view, so they are as fresh as the last
+        refresh_leaderboard(). The month containing end_date is summed from
+        daily summaries up to end_date, so it is always current and never
+        includes later days.
+
+        Args:
+            start_month: First month to include (any day in it)
+            end_date: Last day to include
+            limit: Number of entries to return
+
+        Returns:
+            Leaderboard entries in the same shape as get_leaderboard()
+        """
+        current_month = end_date.replace(day=1)
+        closed_months = select(
+            leaderboard_monthly.c.person_id,
+            leaderboard_monthly.c.convs.label("conversations"),
+            leaderboard_monthly.c.tasks.label("tasks"),
+            leaderboard_monthly.c.score.label("score")
+        ).where(
+            and_(
+                leaderboard_monthly.c.month >= start_month.replace(day=1),
+                leaderboard_monthly.c.month < current_month
+            )
+        )
+        month_to_date = select(
+            ActivitySummary.person_id,
+            ActivitySummary.conversations_created,
+            ActivitySummary.tasks_completed,
+            ActivitySummary.total_activity_score
+        ).where(ActivitySummary.date.between(current_month, end_date))
+        parts = union_all(closed_months, month_to_date).subquery("parts")
+
+        totals = (
+            select(
+                parts.c.person_id,
+                func.sum(parts.c.conversations).label("total_conversations"),
+                func.sum(parts.c.tasks).label("total_tasks"),
+                func.sum(parts.c.score).label("total_score")
+            )
+            .group_by(parts.c.person_id)
+            .order_by(desc("total_score"), parts.c.person_id)
             .limit(limit)
+            .subquery()
         )
 
-        rows = result.all()
+        result = await self.session.execute(
+            select(
+                Person.id,
+                Person.username,
+                totals.c.total_conversations,
+                totals.c.total_tasks,
+                totals.c.total_score
+            )
+            .join(totals, totals.c.person_id == Person.id)
+            .order_by(totals.c.total_score.desc(), Person.id)
+        )
+
+        return self._rank_leaderboard(result.all())
+
+    async def refresh_leaderboard(self) -> None:
+        """
+        Refresh the leaderboard_monthly view from activity_summaries.
+
+        Runs concurrently, so leaderboard reads are not blocked meanwhile.
+        """
+        await self.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY leaderboard_monthly"))
+
+    @staticmethod
+    def _rank_leaderboard(rows) -> List[Dict]:
+        """Number leaderboard rows and convert them to entry dicts."""
         leaderboard = []
         for rank, row in enumerate(rows, start=1):
             leaderboard.append({
@@ -445,22 +861,50 @@ class ActivityRepository:
         """
         Calculate current and longest streak for a person.
 
-        A streak is consecutive days with activity.
+        A streak is consecutive days with activity. Runs of consecutive days
+        are found in SQL (gaps and islands: day minus row number is constant
+        within a run), so only the longest and the latest run are returned.
         """
-        # Get all activity dates
-        result = await self.session.execute(
-            select(ActivitySummary.date)
+        # (person_id, date) is the primary key, so each active day appears once
+        days = (
+            select(ActivitySummary.date.label("day"))
             .where(
                 and_(
                     ActivitySummary.person_id == person_id,
                     ActivitySummary.total_activity_score > 0
                 )
             )
-            .order_by(ActivitySummary.date)
+            .cte("days")
         )
-        activity_dates = [row[0].date() if isinstance(row[0], datetime) else row[0] for row in result.all()]
+        islands = select(
+            days.c.day,
+            (days.c.day - cast(func.row_number().over(order_by=days.c.day), Integer)).label("grp")
+        ).cte("islands")
+        streaks = (
+            select(
+                func.min(islands.c.day).label("start"),
+                func.max(islands.c.day).label("end"),
+                func.count().label("length")
+            )
+            .group_by(islands.c.grp)
+            .cte("streaks")
+        )
+
+        # Longest run (earliest wins a tie) and the most recent run
+        longest = (
+            select(literal("longest").label("kind"), streaks)
+            .order_by(desc(streaks.c.length), streaks.c.start)
+            .limit(1)
+        )
+        latest = (
+            select(literal("latest").label("kind"), streaks)
+            .order_by(desc(streaks.c.end))
+            .limit(1)
+        )
+        result = await self.session.execute(union_all(longest, latest))
+        rows = {row.kind: row for row in result.all()}
 
-        if not activity_dates:
+        if not rows:
             return {
                 "current_streak": 0,
                 "longest_streak": 0,
@@ -469,63 +913,55 @@ class ActivityRepository:
                 "longest_streak_end": None
             }
 
-        # Calculate streaks
-        current_streak = 0
-        current_streak_start = None
-        longest_streak = 0
-        longest_streak_start = None
-        longest_streak_end = None
-        temp_streak = 1
-        temp_streak_start = activity_dates[0]
-
-        today = date.today()
-
-        for i in range(1, len(activity_dates)):
-            prev_date = activity_dates[i - 1]
-            curr_date = activity_dates[i]
-
-            if (curr_date - prev_date).days == 1:
-                temp_streak += 1
-            else:
-                # Streak broken
-                if temp_streak > longest_streak:
-                    longest_streak = temp_streak
-                    longest_streak_start = temp_streak_start
-                    longest_streak_end = prev_date
-
-                temp_streak = 1
-                temp_streak_start = curr_date
-
-        # Check final streak
-        if temp_streak > longest_streak:
-            longest_streak = temp_streak
-            longest_streak_start = temp_streak_start
-            longest_streak_end = activity_dates[-1]
-
-        # Calculate current streak (must include today or yesterday)
-        last_activity = activity_dates[-1]
-        days_since_last = (today - last_activity).days
-
-        if days_since_last <= 1:
-            # Current streak is active
-            current_streak = 1
-            current_streak_start = last_activity
-
-            # Count backwards
-            for i in range(len(activity_dates) - 2, -1, -1):
-                if (activity_dates[i + 1] - activity_dates[i]).days == 1:
-                    current_streak += 1
-                    current_streak_start = activity_dates[i]
-                else:
-                    break
+        longest_row = rows["longest"]
+        latest_row = rows["latest"]
+
+        # Current streak must include today or yesterday
+        if (date.today() - latest_row.end).days <= 1:
+            current_streak = latest_row.length
+            current_streak_start = latest_row.start
         else:
             current_streak = 0
             current_streak_start = None
 
         return {
             "current_streak": current_streak,
-            "longest_streak": longest_streak,
+            "longest_streak": longest_row.length,
             "current_streak_start": current_streak_start,
-            "longest_streak_start": longest_streak_start,
-            "longest_streak_end": longest_streak_end
+            "longest_streak_start": longest_row.start,
+            "longest_streak_end": longest_row.end
         }
+
+    # ==================== Sync State ====================
+
+    async def get_last_successful_sync(self, database_id: str) -> Optional[datetime]:
+        """Get the incremental sync watermark for a Notion database."""
+        result = await self.session.execute(
+            select(ActivitySyncState.last_successful_sync_at).where(
+                ActivitySyncState.database_id == database_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def set_last_successful_sync(
+        self, database_id: str, synced_at: datetime
+    ) -> None:
+        """Store the incremental sync watermark for a Notion database."""
+        stmt = pg_insert(ActivitySyncState).values(
+            database_id=database_id,
+            last_successful_sync_at=synced_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivitySyncState.database_id],
+            set_={
+                "last_successful_sync_at": stmt.excluded.last_successful_sync_at,
+                "updated_at": func.now()
+            }
+        )
+        await self.session.execute(stmt)
+
+        logger.info(
+            "sync_watermark_updated",
+            database_id=database_id,
+            synced_at=synced_at.isoformat()
+        )
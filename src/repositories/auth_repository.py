@@ -7,19 +7,58 @@ This repository handles database queries related to authentication.
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, update, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.schemas.user import User, RefreshToken
 
 
 class AuthRepository:
-    """Repository for authentication-related database operations."""
+    """
+    Repository for authentication-related database operations.
+
+    User lookups are memoized for the lifetime of the repository, which is
+    one request when it comes from a FastAPI dependency, so repeated auth
+    checks for the same user hit the database once.
+    """
 
     def __init__(self, session: AsyncSession):
         self.session: AsyncSession = session
+        self._cache: Dict[Tuple[str, Any], Optional[User]] = {}
+
+    async def _get_user(self, field: str, value: Any) -> Optional[User]:
+        """
+        Get a user by a unique column, reusing earlier lookups.
+
+        Args:
+            field: User column to match ("id", "username" or "email")
+            value: Value to search for
+
+        Returns:
+            User object or None if not found
+        """
+        key = (field, value)
+        if key in self._cache:
+            return self._cache[key]
+
+        column = getattr(User, field)
+        result = await self.session.execute(
+            lambda_stmt(lambda: select(User).where(column == value))
+        )
+        user = result.scalar_one_or_none()
+        if user is None:
+            self._cache[key] = None
+        else:
+            self._remember(user)
+        return user
+
+    def _remember(self, user: User) -> None:
+        """Cache a user under every column it can be looked up by."""
+        self._cache[("id", user.id)] = user
+        self._cache[("username", user.username)] = user
+        self._cache[("email", user.email)] = user
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """
@@ -31,10 +70,7 @@ class AuthRepository:
         Returns:
             User object or None if not found
         """
-        result = await self.session.execute(
-            select(User).where(User.username == username)
-        )
-        return result.scalar_one_or_none()
+        return await self._get_user("username", username)
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """
@@ -46,10 +82,7 @@ class AuthRepository:
         Returns:
             User object or None if not found
         """
-        result = await self.session.execute(
-            select(User).where(User.email == email)
-        )
-        return result.scalar_one_or_none()
+        return await self._get_user("email", email)
 
     async def create_user(self, username: str, email: str, hashed_password: str) -> User:
         """
@@ -72,7 +105,9 @@ class AuthRepository:
 
         self.session.add(user)
         await self.session.flush()
-        await self.session.refresh(user)
+
+        # Earlier lookups may have cached this username or email as missing
+        self._remember(user)
         return user
 
     async def create_refresh_token(
@@ -107,9 +142,46 @@ class AuthRepository:
 
         self.session.add(refresh_token)
         await self.session.flush()
-        await self.session.refresh(refresh_token)
         return refresh_token
 
+    async def create_user_with_refresh_token(
+        self,
+        username: str,
+        email: str,
+        hashed_password: str,
+        token: str,
+        expires_days: int,
+        user_agent: Optional[str] = None,
+        ip_address: Optional[str] = None
+    ) -> Tuple[User, RefreshToken]:
+        """
+        Create a new user together with their first refresh token.
+
+        Server defaults come back in each INSERT's RETURNING, so this takes
+        two statements and no refreshes.
+
+        Args:
+            username: User's username
+            email: User's email
+            hashed_password: Bcrypt hashed password
+            token: Refresh token string
+            expires_days: Number of days until expiration
+            user_agent: User agent string from request
+            ip_address: IP address from request
+
+        Returns:
+            Tuple of the created User and RefreshToken objects
+        """
+        user = await self.create_user(username, email, hashed_password)
+        refresh_token = await self.create_refresh_token(
+            user_id=user.id,
+            token=token,
+            expires_days=expires_days,
+            user_agent=user_agent,
+            ip_address=ip_address
+        )
+        return user, refresh_token
+
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """
         Get a user by ID.
@@ -120,15 +192,15 @@ class AuthRepository:
         Returns:
             User object or None if not found
         """
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        return await self._get_user("id", user_id)
 
     async def get_refresh_token(self, token: str) -> Optional[RefreshToken]:
         """
         Get a refresh token by token string.
 
+        The token's user is loaded by the same query and cached, so the
+        get_user_by_id that follows on the refresh path needs no round trip.
+
         Args:
             token: Refresh token string
 
@@ -136,9 +208,22 @@ class AuthRepository:
             RefreshToken object or None if not found
         """
         result = await self.session.execute(
-            select(RefreshToken).where(RefreshToken.token == token)
+            lambda_stmt(
+                lambda: select(RefreshToken, User)
+                .outerjoin(User, User.id == RefreshToken.user_id)
+                .where(RefreshToken.token == token)
+            )
         )
-        return result.scalar_one_or_none()
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        refresh_token, user = row
+        if user is None:
+            self._cache[("id", refresh_token.user_id)] = None
+        else:
+            self._remember(user)
+        return refresh_token
 
     async def revoke_refresh_token(self, token_id: int) -> None:
         """
@@ -147,11 +232,8 @@ class AuthRepository:
         Args:
             token_id: ID of the refresh token to revoke
         """
-        result = await self.session.execute(
-            select(RefreshToken).where(RefreshToken.id == token_id)
+        await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id)
+            .values(is_revoked=True)
         )
-        refresh_token = result.scalar_one_or_none()
-
-        if refresh_token:
-            refresh_token.is_revoked = True
-            await self.session.flush()
@@ -2,10 +2,18 @@
 Repository for cache database operations.
 Handles CRUD operations for cached Notion data.
 """
+import io
+import json
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Type
 
+from src.db.database import Base
 from src.schemas.notion_cache import (
     CacheMetadata,
     CachedNotionProject,
@@ -14,9 +22,61 @@ from src.schemas.notion_cache import (
     CachedNotionTodo
 )
 
+# Writable project columns, resolved once instead of per upsert
+_PROJECT_COLUMNS = tuple(
+    column.key for column in CachedNotionProject.__table__.columns if column.key != "cached_at"
+)
+
+# Rows of each cache table, shared by every repository in the process and
+# keyed by the cache_metadata.last_updated they were read under. The rows
+# are immutable snapshots (see _get_all_cached), so no caller can change
+# what the others see.
+_table_rows: Dict[str, Tuple[datetime, tuple]] = {}
+
+
+@lru_cache(maxsize=None)
+def _row_type(model: Type[Base]) -> type:
+    """Named tuple with a cache model's columns, used for the shared rows"""
+    return namedtuple(f"{model.__name__}Row", [column.key for column in model.__table__.columns])
+
+
+def _freeze(value: Any) -> Any:
+    """Make a column value immutable: JSON lists become tuples, objects read-only mappings"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _copy_value(value: Any) -> str:
+    """Encode one value as a field of COPY's text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
 
 class CacheRepository:
-    """Repository for managing cached Notion data"""
+    """
+    Repository for managing cached Notion data.
+
+    Deliberately synchronous: it is used by the Celery cache tasks, which
+    run each Notion call on a throwaway event loop that an asyncpg pool
+    cannot outlive, and by the cached Notion endpoints. Those endpoints are
+    plain ``def`` routes, so FastAPI runs them in its threadpool and the
+    blocking queries never stall the event loop. Keep them that way.
+    """
 
     def __init__(self, db: Session):
         self.db = db
@@ -38,9 +98,10 @@ class CacheRepository:
     ) -> CacheMetadata:
         """Update or create cache metadata"""
         metadata = self.get_cache_metadata(cache_type)
-        
+        now = datetime.now(timezone.utc)
+
         if metadata:
-            metadata.last_updated = datetime.utcnow()
+            metadata.last_updated = now
             metadata.is_updating = False
             metadata.total_records = total_records
             metadata.update_duration_seconds = update_duration_seconds
@@ -48,7 +109,7 @@ class CacheRepository:
         else:
             metadata = CacheMetadata(
                 cache_type=cache_type,
-                last_updated=datetime.utcnow(),
+                last_updated=now,
                 is_updating=False,
                 total_records=total_records,
                 update_duration_seconds=update_duration_seconds,
@@ -60,22 +121,36 @@ class CacheRepository:
         self.db.refresh(metadata)
         return metadata
 
-    def set_cache_updating(self, cache_type: str, is_updating: bool):
-        """Set the updating status for a cache"""
-        metadata = self.get_cache_metadata(cache_type)
-        
-        if metadata:
-            metadata.is_updating = is_updating
-        else:
-            metadata = CacheMetadata(
-                cache_type=cache_type,
-                last_updated=datetime.utcnow(),
-                is_updating=is_updating,
-                total_records=0
-            )
-            self.db.add(metadata)
-        
+    def set_cache_updating(self, cache_type: str, is_updating: bool) -> bool:
+        """
+        Set the updating status for a cache.
+
+        Claiming a cache (is_updating=True) is a single atomic upsert that
+        only succeeds if no other worker holds the flag, so two refreshes of
+        the same cache can't both start.
+
+        Args:
+            cache_type: Cache metadata type
+            is_updating: New updating status
+
+        Returns:
+            False if is_updating was requested but another worker already holds it
+        """
+        stmt = pg_insert(CacheMetadata).values(
+            cache_type=cache_type,
+            last_updated=datetime.now(timezone.utc),
+            is_updating=is_updating,
+            total_records=0
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheMetadata.cache_type],
+            set_={"is_updating": is_updating},
+            where=CacheMetadata.is_updating.is_not(True) if is_updating else None
+        ).returning(CacheMetadata.id)
+
+        updated = self.db.scalar(stmt) is not None
         self.db.commit()
+        return updated
 
     def is_cache_fresh(self, cache_type: str, max_age_minutes: int = 30) -> bool:
         """Check if cache is fresh (updated recently)"""
@@ -84,77 +159,183 @@ class CacheRepository:
         if not metadata:
             return False
         
-        age = datetime.utcnow() - metadata.last_updated
+        age = datetime.now(timezone.utc) - metadata.last_updated
         return age < timedelta(minutes=max_age_minutes)
 
-    # ============= Project Cache Operations =============
+    def _replace_cache(self, model: Type[Base], objects: List[Base]):
+        """
+        Swap the contents of a cache table for the given rows.
 
-    def get_all_cached_projects(self) -> List[CachedNotionProject]:
-        """Get all cached projects"""
-        return self.db.query(CachedNotionProject).all()
+        The table is truncated and refilled with COPY in a single transaction,
+        so readers never see it empty; they wait on the TRUNCATE lock until
+        the commit and then see the new rows. Columns with a server default
+        (cached_at) are left to the database, Python-side defaults are
+        applied here because COPY skips them.
 
-    def clear_projects_cache(self):
-        """Clear all cached projects"""
-        self.db.query(CachedNotionProject).delete()
-        self.db.commit()
+        Args:
+            model: Cache model whose table is replaced
+            objects: Transient model instances to store
+        """
+        table = model.__table__
+        columns = [column for column in table.columns if column.server_default is None]
+
+        buffer = io.StringIO()
+        for obj in objects:
+            fields = []
+            for column in columns:
+                if column.key in obj.__dict__:
+                    value = obj.__dict__[column.key]
+                elif column.default is not None:
+                    value = column.default.arg(None) if column.default.is_callable else column.default.arg
+                else:
+                    value = None
+                fields.append(_copy_value(value))
+            buffer.write("\t".join(fields) + "\n")
+        buffer.seek(0)
 
-    def bulk_insert_projects(self, projects: List[CachedNotionProject]):
-        """Bulk insert projects"""
-        self.db.bulk_save_objects(projects)
+        self.db.execute(text(f"TRUNCATE {table.name}"))
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(column.name for column in columns)}) FROM STDIN",
+                buffer
+            )
+        finally:
+            cursor.close()
         self.db.commit()
 
+    def _get_all_cached(self, cache_type: str, model: Type[Base]) -> list:
+        """
+        Get every row of a cache table, reusing the previous read while it is current.
+
+        The table is only re-read when the cache's last_updated timestamp
+        has moved since the rows were stored, which every refresh does after
+        committing its new rows, so a warm call costs one indexed metadata
+        lookup. Rows are shared by every caller in the process, so they are
+        returned as immutable named tuples with the model's column names
+        rather than ORM instances.
+
+        Args:
+            cache_type: Cache metadata type ("projects", "tasks" or "todos")
+            model: Cache model of that table
+
+        Returns:
+            List of read-only rows, one per cached model instance
+        """
+        # Read the version before the rows, so rows are never stored under a newer version
+        version = self.db.scalar(
+            select(CacheMetadata.last_updated).where(CacheMetadata.cache_type == cache_type)
+        )
+
+        cached = _table_rows.get(cache_type)
+        if version is not None and cached is not None and cached[0] == version:
+            return list(cached[1])
+
+        row_type = _row_type(model)
+        rows = tuple(
+            row_type(*map(_freeze, row)) for row in self.db.execute(select(model.__table__))
+        )
+        if version is not None:
+            _table_rows[cache_type] = (version, rows)
+
+        return list(rows)
+
+    # ============= Project Cache Operations =============
+
+    def get_all_cached_projects(self) -> list:
+        """Get all cached projects as read-only rows with the CachedNotionProject columns"""
+        return self._get_all_cached("projects", CachedNotionProject)
+
+    def replace_projects_cache(self, projects: List[CachedNotionProject]):
+        """Replace all cached projects in one transaction (TRUNCATE + COPY)"""
+        self._replace_cache(CachedNotionProject, projects)
+
     def upsert_project(self, project: CachedNotionProject):
         """Insert or update a single project"""
-        existing = self.db.query(CachedNotionProject).filter(
-            CachedNotionProject.page_id == project.page_id
-        ).first()
-        
-        if existing:
-            for key, value in project.__dict__.items():
-                if not key.startswith('_'):
-                    setattr(existing, key, value)
-        else:
-            self.db.add(project)
-        
-        self.db.commit()
+        self.upsert_projects([project])
 
-    # ============= Task Cache Operations =============
+    def upsert_projects(self, projects: List[CachedNotionProject]):
+        """
+        Insert or update projects with INSERT ... ON CONFLICT (page_id) DO UPDATE.
 
-    def get_all_cached_tasks(self) -> List[CachedNotionTask]:
-        """Get all cached tasks"""
-        return self.db.query(CachedNotionTask).all()
+        Only the attributes set on each project are written, so an update
+        leaves the other columns alone and an insert still gets the defaults.
+        The NOT NULL columns must still be set, as Postgres checks them on the
+        proposed row before it detects the conflict. Projects are grouped by which attributes they set, and each group is
+        sent as one statement. Rows whose values are unchanged are not
+        rewritten. If a page_id appears more than once, the last project wins.
+        The projects cache's last_updated is bumped in the same transaction,
+        so processes holding the rows from _get_all_cached re-read the table.
 
-    def clear_tasks_cache(self):
-        """Clear all cached tasks"""
-        self.db.query(CachedNotionTask).delete()
-        self.db.commit()
+        Args:
+            projects: Transient project models to store
+        """
+        rows = {}
+        for project in projects:
+            values = project.__dict__
+            rows[project.page_id] = {key: values[key] for key in _PROJECT_COLUMNS if key in values}
+        if not rows:
+            return
+
+        # One statement per set of populated columns, since the SET list and
+        # the executemany parameters must be the same for every row
+        groups: Dict[Tuple[str, ...], List[dict]] = {}
+        for row in rows.values():
+            groups.setdefault(tuple(row), []).append(row)
 
-    def bulk_insert_tasks(self, tasks: List[CachedNotionTask]):
-        """Bulk insert tasks"""
-        self.db.bulk_save_objects(tasks)
+        table = CachedNotionProject.__table__
+        for keys, group in groups.items():
+            updated = [key for key in keys if key != "page_id"]
+            stmt = pg_insert(CachedNotionProject)
+            if updated:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[CachedNotionProject.page_id],
+                    set_={
+                        **{key: stmt.excluded[key] for key in updated},
+                        "cached_at": func.now(),
+                    },
+                    # Leave unchanged rows alone (no dead tuple, cached_at kept)
+                    where=or_(*[table.c[key].is_distinct_from(stmt.excluded[key]) for key in updated])
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=[CachedNotionProject.page_id])
+            self.db.execute(stmt, group)
+
+        self.db.execute(
+            update(CacheMetadata)
+            .where(CacheMetadata.cache_type == "projects")
+            .values(last_updated=datetime.now(timezone.utc))
+        )
         self.db.commit()
 
+    # ============= Task Cache Operations =============
+
+    def get_all_cached_tasks(self) -> list:
+        """Get all cached tasks as read-only rows with the CachedNotionTask columns"""
+        return self._get_all_cached("tasks", CachedNotionTask)
+
+    def replace_tasks_cache(self, tasks: List[CachedNotionTask]):
+        """Replace all cached tasks in one transaction (TRUNCATE + COPY)"""
+        self._replace_cache(CachedNotionTask, tasks)
+
     # ============= Team Member Cache Operations =============
 
     def get_or_create_team_member(self, member_name: str, **kwargs) -> CachedTeamMember:
-        """Get existing team member or create new one"""
-        member = self.db.query(CachedTeamMember).filter(
-            CachedTeamMember.member_name == member_name
-        ).first()
-        
-        if not member:
-            member = CachedTeamMember(member_name=member_name, **kwargs)
-            self.db.add(member)
-            self.db.commit()
-            self.db.refresh(member)
-        else:
+        """Get existing team member or create new one, in a single upsert"""
+        columns = CachedTeamMember.__table__.columns
+        values = {key: value for key, value in kwargs.items() if key in columns}
+
+        stmt = pg_insert(CachedTeamMember).values(member_name=member_name, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CachedTeamMember.member_name],
             # Update fields if provided
-            for key, value in kwargs.items():
-                if hasattr(member, key):
-                    setattr(member, key, value)
-            self.db.commit()
-            self.db.refresh(member)
-        
+            set_={**values, "cached_at": func.now()}
+        ).returning(CachedTeamMember)
+
+        member = self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+        self.db.commit()
         return member
 
     def get_all_cached_team_members(self) -> List[CachedTeamMember]:
@@ -163,9 +344,9 @@ class CacheRepository:
 
     # ============= Todo Cache Operations =============
 
-    def get_all_cached_todos(self) -> List[CachedNotionTodo]:
-        """Get all cached todos"""
-        return self.db.query(CachedNotionTodo).all()
+    def get_all_cached_todos(self) -> list:
+        """Get all cached todos as read-only rows with the CachedNotionTodo columns"""
+        return self._get_all_cached("todos", CachedNotionTodo)
 
     def get_todos_by_member(self, member_name: str) -> List[CachedNotionTodo]:
         """Get todos for a specific team member"""
@@ -179,12 +360,6 @@ class CacheRepository:
             CachedNotionTodo.is_overdue.is_(True)
         ).all()
 
-    def clear_todos_cache(self):
-        """Clear all cached todos"""
-        self.db.query(CachedNotionTodo).delete()
-        self.db.commit()
-
-    def bulk_insert_todos(self, todos: List[CachedNotionTodo]):
-        """Bulk insert todos"""
-        self.db.bulk_save_objects(todos)
-        self.db.commit()
+    def replace_todos_cache(self, todos: List[CachedNotionTodo]):
+        """Replace all cached todos in one transaction (TRUNCATE + COPY)"""
+        self._replace_cache(CachedNotionTodo, todos)
@@ -5,10 +5,12 @@ This repository handles CRUD operations for Person entities.
 """
 
 from typing import Optional, List
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.person import Person
 from src.core.logging import get_logger
+from src.repositories._upsert import INSERTED, UPSERT_BATCH_SIZE
 
 logger = get_logger(__name__)
 
@@ -50,7 +52,6 @@ class PersonRepository:
 
         self.session.add(person)
         await self.session.flush()
-        await self.session.refresh(person)
 
         logger.info("person_created", person_id=person.id, notion_id=notion_id, username=username)
         return person
@@ -66,7 +67,7 @@ class PersonRepository:
             Person object or None if not found
         """
         result = await self.session.execute(
-            select(Person).where(Person.id == person_id)
+            lambda_stmt(lambda: select(Person).where(Person.id == person_id))
         )
         return result.scalar_one_or_none()
 
@@ -81,7 +82,7 @@ class PersonRepository:
             Person object or None if not found
         """
         result = await self.session.execute(
-            select(Person).where(Person.notion_id == notion_id)
+            lambda_stmt(lambda: select(Person).where(Person.notion_id == notion_id))
         )
         return result.scalar_one_or_none()
 
@@ -96,7 +97,7 @@ class PersonRepository:
             Person object or None if not found
         """
         result = await self.session.execute(
-            select(Person).where(Person.email == email)
+            lambda_stmt(lambda: select(Person).where(Person.email == email))
         )
         return result.scalar_one_or_none()
 
@@ -111,7 +112,7 @@ class PersonRepository:
             Person object or None if not found
         """
         result = await self.session.execute(
-            select(Person).where(Person.telegram_id == telegram_id)
+            lambda_stmt(lambda: select(Person).where(Person.telegram_id == telegram_id))
         )
         return result.scalar_one_or_none()
 
@@ -132,7 +133,7 @@ class PersonRepository:
         Returns:
             Tuple of (list of Person objects, total count)
         """
-        query = select(Person)
+        query = select(Person, func.count().over().label("total"))
 
         # Apply search filter if provided
         if search:
@@ -144,18 +145,26 @@ class PersonRepository:
                 )
             )
 
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.session.execute(count_query)
-        total = total_result.scalar_one()
-
-        # Apply pagination
-        query = query.offset(skip).limit(limit).order_by(Person.username)
-
-        result = await self.session.execute(query)
-        persons = result.scalars().all()
+        # COUNT(*) OVER () carries the unpaginated total on every returned row,
+        # saving a separate count query
+        result = await self.session.execute(
+            query.order_by(Person.username, Person.id).offset(skip).limit(limit)
+        )
+        rows = result.all()
+
+        persons = [row.Person for row in rows]
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Page past the end: no row to read the total from
+            count_query = select(func.count()).select_from(
+                query.with_only_columns(Person.id).subquery()
+            )
+            total = (await self.session.execute(count_query)).scalar_one()
+        else:
+            total = 0
 
-        return list(persons), total
+        return persons, total
 
     async def update(
         self,
@@ -192,7 +201,6 @@ class PersonRepository:
             person.telegram_id = telegram_id
 
         await self.session.flush()
-        await self.session.refresh(person)
 
         logger.info("person_updated", person_id=person_id)
         return person
@@ -243,7 +251,6 @@ class PersonRepository:
                 person.username = username
                 person.avatar_url = avatar_url
                 await self.session.flush()
-                await self.session.refresh(person)
             return person, False
 
         # Create new person
@@ -266,16 +273,104 @@ class PersonRepository:
             persons_data: List of dicts with keys: notion_id, username, avatar_url (optional), email (optional)
 
         Returns:
-            List of tuples (Person object, created flag)
+            List of tuples (Person object, created flag), in input order
         """
+        if not persons_data:
+            return []
+
+        # Existing persons in one query
+        result = await self.session.execute(
+            select(Person).where(Person.notion_id.in_({data["notion_id"] for data in persons_data}))
+        )
+        persons = {person.notion_id: person for person in result.scalars()}
+
+        # Missing persons in one insert; the first occurrence of each Notion ID is used
+        new_rows = {}
+        for data in persons_data:
+            if data["notion_id"] not in persons and data["notion_id"] not in new_rows:
+                new_rows[data["notion_id"]] = {
+                    "notion_id": data["notion_id"],
+                    "username": data["username"],
+                    "avatar_url": data.get("avatar_url"),
+                    "email": data.get("email")
+                }
+
+        if new_rows:
+            stmt = pg_insert(Person)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Person.notion_id],
+                set_={
+                    "username": stmt.excluded.username,
+                    "avatar_url": stmt.excluded.avatar_url,
+                    "updated_at": func.now()
+                }
+            ).returning(Person)
+            inserted = await self.session.scalars(stmt, list(new_rows.values()))
+            persons.update((person.notion_id, person) for person in inserted)
+
         results = []
+        pending_created = set(new_rows)
         for data in persons_data:
-            person, created = await self.get_or_create_by_notion_id(
-                notion_id=data["notion_id"],
-                username=data["username"],
-                avatar_url=data.get("avatar_url"),
-                email=data.get("email")
-            )
+            person = persons[data["notion_id"]]
+            created = data["notion_id"] in pending_created
+
+            if created:
+                pending_created.discard(data["notion_id"])
+            elif person.username != data["username"] or person.avatar_url != data.get("avatar_url"):
+                # Update username and avatar if changed
+                person.username = data["username"]
+                person.avatar_url = data.get("avatar_url")
+
             results.append((person, created))
 
+        await self.session.flush()
+
+        logger.info("persons_bulk_get_or_create", created=len(new_rows), total=len(results))
+        return results
+
+    async def bulk_upsert(self, persons_data: List[dict]) -> List[tuple[int, str, bool]]:
+        """
+        Create or update persons by Notion ID with INSERT ... ON CONFLICT DO UPDATE.
+
+        Existing persons get the new username and avatar, and the new
+        telegram_id when one is given; their email is left unchanged.
+        Rows are de-duplicated by notion_id (last one wins) and sent in
+        chunks of UPSERT_BATCH_SIZE.
+
+        Args:
+            persons_data: List of dicts with keys: notion_id, username,
+                avatar_url (optional), email (optional), telegram_id (optional)
+
+        Returns:
+            List of tuples (person ID, Notion ID, created flag)
+        """
+        rows = list({
+            data["notion_id"]: {
+                "notion_id": data["notion_id"],
+                "username": data["username"],
+                "avatar_url": data.get("avatar_url"),
+                "email": data.get("email"),
+                "telegram_id": data.get("telegram_id")
+            }
+            for data in persons_data
+        }.values())
+
+        stmt = pg_insert(Person)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Person.notion_id],
+            set_={
+                "username": stmt.excluded.username,
+                "avatar_url": stmt.excluded.avatar_url,
+                "telegram_id": func.coalesce(stmt.excluded.telegram_id, Person.telegram_id),
+                "updated_at": func.now()
+            }
+        ).returning(Person.id, Person.notion_id, INSERTED)
+
+        results = []
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            result = await self.session.execute(stmt, rows[i:i + UPSERT_BATCH_SIZE])
+            results.extend((row[0], row[1], bool(row[2])) for row in result.all())
+
+        created = sum(1 for _, _, inserted in results if inserted)
+        logger.info("persons_upserted", created=created, updated=len(results) - created)
         return results
@@ -9,11 +9,13 @@ from sqlalchemy import (
     DateTime,
     Integer,
     Boolean,
+    Date,
     Text,
-    func
+    func,
+    Index
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from datetime import datetime
+from datetime import date, datetime
 
 
 class CacheMetadata(Base):
@@ -53,14 +55,20 @@ class CachedNotionProject(Base):
 class CachedNotionTask(Base):
     """Cached task data from Notion"""
     __tablename__ = "cached_notion_tasks"
+    __table_args__ = (
+        Index(
+            "ix_tasks_status_priority", "status", "priority",
+            postgresql_include=["task_name", "due_date"]
+        ),
+    )
 
     page_id: Mapped[str] = mapped_column(String(100), primary_key=True, index=True)
     task_name: Mapped[str] = mapped_column(String(500), nullable=False)
-    status: Mapped[str | None] = mapped_column(String(100), nullable=True, index=True)
+    status: Mapped[str | None] = mapped_column(String(100), nullable=True)
     priority: Mapped[str | None] = mapped_column(String(50), nullable=True)
     effort_level: Mapped[str | None] = mapped_column(String(50), nullable=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    due_date: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    due_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     task_type: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
     assignee: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
     notion_created_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -84,14 +92,20 @@ class CachedTeamMember(Base):
 class CachedNotionTodo(Base):
     """Cached todo/task data from team member Kanban boards"""
     __tablename__ = "cached_notion_todos"
+    __table_args__ = (
+        Index(
+            "ix_todos_member_overdue", "member_name", "is_overdue",
+            postgresql_include=["task_name", "deadline", "status", "url"]
+        ),
+    )
 
     todo_id: Mapped[str] = mapped_column(String(100), primary_key=True, index=True)
-    member_name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    member_name: Mapped[str] = mapped_column(String(255), nullable=False)
     task_name: Mapped[str] = mapped_column(String(500), nullable=False)
     status: Mapped[str | None] = mapped_column(String(100), nullable=True, index=True)
-    deadline: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    date_done: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    is_overdue: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+    deadline: Mapped[date | None] = mapped_column(Date, nullable=True)
+    date_done: Mapped[date | None] = mapped_column(Date, nullable=True)
+    is_overdue: Mapped[bool] = mapped_column(Boolean, default=False)
     project_ids: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
     url: Mapped[str] = mapped_column(String(500), nullable=False)
     cached_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
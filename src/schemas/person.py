@@ -5,19 +5,20 @@ This module contains SQLAlchemy models for tracking persons and their activities
 from Notion databases (conversations and tasks).
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import (
     String,
+    Date,
     DateTime,
     Integer,
     func,
     ForeignKey,
     Index,
     UniqueConstraint,
-    Text,
-    JSON
+    Text
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from src.db.database import Base
 
 
@@ -38,15 +39,32 @@ class Person(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Trigram index so get_all's ILIKE '%term%' search can use an index (needs pg_trgm)
+        Index(
+            "ix_person_trgm", "username", "email",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops", "email": "gin_trgm_ops"}
+        ),
+    )
+
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relationships
+    # Activity collections can hold thousands of rows: never lazy-load them
+    # (use selectinload() explicitly), and let the ON DELETE CASCADE foreign
+    # keys remove them instead of loading and deleting each row on person delete
     conversation_activities: Mapped[list["ConversationActivity"]] = relationship(
-        "ConversationActivity", back_populates="person", cascade="all, delete-orphan"
+        "ConversationActivity", back_populates="person", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True
     )
     task_activities: Mapped[list["TaskActivity"]] = relationship(
-        "TaskActivity", back_populates="person", cascade="all, delete-orphan"
+        "TaskActivity", back_populates="person", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True
     )
     activity_summaries: Mapped[list["ActivitySummary"]] = relationship(
-        "ActivitySummary", back_populates="person", cascade="all, delete-orphan"
+        "ActivitySummary", back_populates="person", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True
     )
 
     def __repr__(self) -> str:
@@ -68,7 +86,7 @@ class ConversationActivity(Base):
     conversation_title: Mapped[str] = mapped_column(String(500), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     last_synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    notion_metadata: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    notion_metadata: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     # Relationship
     person: Mapped["Person"] = relationship("Person", back_populates="conversation_activities")
@@ -80,6 +98,8 @@ class ConversationActivity(Base):
         Index("ix_conversation_notion_id_person", "notion_conversation_id", "person_id", unique=True),
     )
 
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         return f"<ConversationActivity(id={self.id}, person_id={self.person_id}, title='{self.conversation_title}')>"
 
@@ -100,7 +120,7 @@ class TaskActivity(Base):
     completed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     last_status_change: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     last_synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    notion_metadata: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    notion_metadata: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     # Relationship
     person: Mapped["Person"] = relationship("Person", back_populates="task_activities")
@@ -110,6 +130,8 @@ class TaskActivity(Base):
         Index("ix_task_person_completed", "person_id", "completed_at"),
     )
 
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         return f"<TaskActivity(id={self.id}, person_id={self.person_id}, task_title='{self.task_title}')>"
 
@@ -124,7 +146,7 @@ class ActivitySummary(Base):
     __tablename__ = "activity_summaries"
 
     person_id: Mapped[int] = mapped_column(Integer, ForeignKey("persons.id", ondelete="CASCADE"), primary_key=True)
-    date: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)  # UTC calendar day
     conversations_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     tasks_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     total_activity_score: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -135,10 +157,37 @@ class ActivitySummary(Base):
     person: Mapped["Person"] = relationship("Person", back_populates="activity_summaries")
 
     # Indexes for efficient queries
+    # (fillfactor and extended statistics are set in the tune_activity_summaries_storage migration)
     __table_args__ = (
-        Index("ix_activity_date", "date"),
+        # Leaderboard range scans as index-only scans; also serves plain date filters
+        Index(
+            "ix_activity_date_score", "date", "total_activity_score",
+            postgresql_include=["person_id", "conversations_created", "tasks_completed"]
+        ),
         Index("ix_activity_score", "total_activity_score"),
+        # Per-person date-range reads (stats, heatmap) as index-only scans
+        Index(
+            "ix_activity_person_date_covering", "person_id", "date",
+            postgresql_include=["total_activity_score", "conversations_created", "tasks_completed"]
+        ),
     )
 
     def __repr__(self) -> str:
         return f"<ActivitySummary(person_id={self.person_id}, date={self.date}, score={self.total_activity_score})>"
+
+
+class ActivitySyncState(Base):
+    """
+    Incremental sync watermark per Notion database.
+
+    Stores the start time of the last sync that finished without errors,
+    so the next run only asks Notion for pages edited since then.
+    """
+    __tablename__ = "activity_sync_states"
+
+    database_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_successful_sync_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<ActivitySyncState(database_id='{self.database_id}', last_successful_sync_at={self.last_successful_sync_at})>"
@@ -21,6 +21,8 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class RegistrationToken(Base):
     __tablename__ = "registration_tokens"
@@ -45,6 +47,8 @@ class RefreshToken(Base):
     user_agent: Mapped[str | None] = mapped_column(String(500), nullable=True)
     ip_address: Mapped[str | None] = mapped_column(String(45), nullable=True)  # IPv6 support
 
+    __mapper_args__ = {"eager_defaults": True}
+
 
 
 
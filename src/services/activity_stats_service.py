@@ -4,6 +4,8 @@ Activity statistics service.
 This service handles activity statistics calculations and aggregations.
 """
 
+from bisect import bisect_right
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,6 +27,40 @@ from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Days written per transaction by bulk_aggregate_daily_activities
+BULK_AGGREGATION_CHUNK_DAYS = 31
+
+# Periods that start on the first of a month; their past months are served from leaderboard_monthly
+MONTHLY_LEADERBOARD_PERIODS = (PeriodType.MONTHLY, PeriodType.YEARLY, PeriodType.ALL_TIME)
+
+
+@lru_cache(maxsize=32)
+def _period_range(period: PeriodType, today: date) -> tuple[date, date]:
+    """
+    Calculate start and end dates for a period type as of a given day.
+
+    Pure in (period, today), so results are cached; the cache only grows
+    by one entry per period per day.
+    """
+    if period == PeriodType.DAILY:
+        return today, today
+
+    elif period == PeriodType.WEEKLY:
+        start = today - timedelta(days=today.weekday())  # Monday
+        return start, today
+
+    elif period == PeriodType.MONTHLY:
+        start = today.replace(day=1)
+        return start, today
+
+    elif period == PeriodType.YEARLY:
+        start = today.replace(month=1, day=1)
+        return start, today
+
+    else:  # ALL_TIME
+        # Return a very early date
+        return date(2020, 1, 1), today
+
 
 class ActivityStatsService:
     """Service for activity statistics and aggregations."""
@@ -98,20 +134,15 @@ class ActivityStatsService:
         if not start_date or not end_date:
             start_date, end_date = self._calculate_period_range(period)
 
-        # Get summaries for the period
-        summaries = await self.activity_repo.get_summaries_for_person(
+        # Get daily summaries and their totals for the period in one query
+        totals, summaries = await self.activity_repo.get_person_stats_with_totals(
             person_id=person_id, start_date=start_date, end_date=end_date
         )
 
-        # Aggregate totals
-        total_conversations = sum(s.conversations_created for s in summaries)
-        total_tasks = sum(s.tasks_completed for s in summaries)
-        total_score = sum(s.total_activity_score for s in summaries)
-
         # Create daily breakdown
         daily_breakdown = [
             DailyActivityStats(
-                date=s.date.date() if isinstance(s.date, datetime) else s.date,
+                date=s.date,
                 conversations_created=s.conversations_created,
                 tasks_completed=s.tasks_completed,
                 total_activity_score=s.total_activity_score
@@ -124,9 +155,9 @@ class ActivityStatsService:
             period=period,
             start_date=start_date,
             end_date=end_date,
-            total_conversations=total_conversations,
-            total_tasks_completed=total_tasks,
-            total_activity_score=total_score,
+            total_conversations=totals["conversations_created"],
+            total_tasks_completed=totals["tasks_completed"],
+            total_activity_score=totals["total_activity_score"],
             daily_breakdown=daily_breakdown
         )
 
@@ -146,48 +177,35 @@ class ActivityStatsService:
         end_date = date.today()
         start_date = end_date - timedelta(days=days - 1)
 
-        # Get summaries
-        summaries = await self.activity_repo.get_summaries_for_person(
+        # One row per day, with None where the person has no summary
+        rows = await self.activity_repo.get_heatmap_rows(
             person_id=person_id, start_date=start_date, end_date=end_date
         )
 
-        # Create a map of date -> activity score
-        activity_map = {
-            (s.date.date() if isinstance(s.date, datetime) else s.date): s.total_activity_score
-            for s in summaries
-        }
-
         # Calculate max activity for level calculation
-        max_activity = max(activity_map.values()) if activity_map else 1
+        scores = [score for _, score in rows if score is not None]
+        max_activity = max(scores) if scores else 1
+
+        # Level thresholds (GitHub-style 0-4): a day at or above the n-th
+        # quarter of max_activity gets level n + 1
+        thresholds = (max_activity * 0.25, max_activity * 0.5, max_activity * 0.75)
 
-        # Generate heatmap data for all days in range
         heatmap_data = []
-        current_date = start_date
         active_days = 0
 
-        while current_date <= end_date:
-            activity_count = activity_map.get(current_date, 0)
+        for current_date, activity_count in rows:
+            activity_count = activity_count or 0
+
             if activity_count > 0:
                 active_days += 1
-
-            # Calculate level (0-4 like GitHub)
-            if activity_count == 0:
-                level = 0
-            elif activity_count >= max_activity * 0.75:
-                level = 4
-            elif activity_count >= max_activity * 0.5:
-                level = 3
-            elif activity_count >= max_activity * 0.25:
-                level = 2
+                level = 1 + bisect_right(thresholds, activity_count)
             else:
-                level = 1
+                level = 0
 
             heatmap_data.append(
                 HeatmapData(date=current_date, count=activity_count, level=level)
             )
 
-            current_date += timedelta(days=1)
-
         return HeatmapResponse(
             person_id=person_id,
             start_date=start_date,
@@ -213,9 +231,15 @@ class ActivityStatsService:
         """
         start_date, end_date = self._calculate_period_range(period)
 
-        leaderboard_data = await self.activity_repo.get_leaderboard(
-            start_date=start_date, end_date=end_date, limit=limit
-        )
+        if period in MONTHLY_LEADERBOARD_PERIODS:
+            # Past months come from the leaderboard_monthly view
+            leaderboard_data = await self.activity_repo.get_monthly_leaderboard(
+                start_month=start_date, end_date=end_date, limit=limit
+            )
+        else:
+            leaderboard_data = await self.activity_repo.get_leaderboard(
+                start_date=start_date, end_date=end_date, limit=limit
+            )
 
         entries = [LeaderboardEntry(**entry) for entry in leaderboard_data]
 
@@ -223,6 +247,18 @@ class ActivityStatsService:
             period=period, start_date=start_date, end_date=end_date, entries=entries
         )
 
+    async def refresh_leaderboard(self) -> None:
+        """Refresh the precomputed monthly leaderboard from the daily summaries."""
+        try:
+            await self.activity_repo.refresh_leaderboard()
+        except Exception as e:
+            logger.error("leaderboard_refresh_failed", error=str(e))
+            await self.session.rollback()
+            raise
+
+        await self.session.commit()
+        logger.info("leaderboard_refreshed")
+
     async def get_streak_info(self, person_id: int) -> StreakInfo:
         """
         Get streak information for a person.
@@ -261,12 +297,51 @@ class ActivityStatsService:
             total_activity_score=summary.total_activity_score
         )
 
+    async def aggregate_range_activities(
+        self, person_id: int, start_date: date, end_date: date
+    ) -> int:
+        """
+        Aggregate daily activities for a person over a date range.
+
+        Args:
+            person_id: Person ID
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Number of summaries created/updated
+        """
+        try:
+            count = await self.activity_repo.aggregate_range_activities(
+                person_id=person_id, start_date=start_date, end_date=end_date
+            )
+        except Exception as e:
+            logger.error(
+                "aggregation_failed",
+                person_id=person_id,
+                start_date=start_date,
+                end_date=end_date,
+                error=str(e)
+            )
+            await self.session.rollback()
+            raise
+
+        await self.session.commit()
+        logger.info("range_aggregation_completed", person_id=person_id, summaries_created=count)
+
+        return count
+
     async def bulk_aggregate_daily_activities(
         self, start_date: date, end_date: date
     ) -> int:
         """
         Aggregate daily activities for all persons in a date range.
 
+        The range is written in windows of BULK_AGGREGATION_CHUNK_DAYS days,
+        each committed on its own, so a year-long run never holds one huge
+        transaction. Summaries are recomputed rather than incremented, so
+        if a window fails, rerunning the range fixes it.
+
         Args:
             start_date: Start date
             end_date: End date
@@ -274,55 +349,56 @@ class ActivityStatsService:
         Returns:
             Number of summaries created/updated
         """
-        from src.repositories.person_repository import PersonRepository
-
-        person_repo = PersonRepository(self.session)
-        persons, _ = await person_repo.get_all(limit=10000)  # Get all persons
-
         count = 0
-        current_date = start_date
-
-        while current_date <= end_date:
-            for person in persons:
-                try:
-                    await self.activity_repo.aggregate_daily_activities(
-                        person_id=person.id, target_date=current_date
-                    )
-                    count += 1
-                except Exception as e:
-                    logger.error(
-                        "aggregation_failed",
-                        person_id=person.id,
-                        date=current_date,
-                        error=str(e)
-                    )
-
-            current_date += timedelta(days=1)
+        chunk_start = start_date
+
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=BULK_AGGREGATION_CHUNK_DAYS - 1), end_date)
+            try:
+                count += await self.activity_repo.bulk_aggregate_daily_activities(
+                    start_date=chunk_start, end_date=chunk_end
+                )
+                if chunk_end == end_date:
+                    await self.activity_repo.refresh_leaderboard()
+            except Exception as e:
+                logger.error(
+                    "aggregation_failed",
+                    start_date=chunk_start,
+                    end_date=chunk_end,
+                    error=str(e)
+                )
+                await self.session.rollback()
+                raise
+
+            await self.session.commit()
+            chunk_start = chunk_end + timedelta(days=1)
 
-        await self.session.commit()
         logger.info("bulk_aggregation_completed", summaries_created=count)
 
         return count
 
-    def _calculate_period_range(self, period: PeriodType) -> tuple[date, date]:
-        """Calculate start and end dates for a period type."""
-        today = date.today()
+    async def aggregate_person_days(self, keys) -> int:
+        """
+        Refresh daily summaries for the (person, day) pairs touched by a sync.
 
-        if period == PeriodType.DAILY:
-            return today, today
+        Args:
+            keys: Iterable of (person_id, date) pairs
 
-        elif period == PeriodType.WEEKLY:
-            start = today - timedelta(days=today.weekday())  # Monday
-            return start, today
+        Returns:
+            Number of summaries created/updated
+        """
+        try:
+            count = await self.activity_repo.aggregate_person_days(keys)
+        except Exception as e:
+            logger.error("aggregation_failed", error=str(e))
+            await self.session.rollback()
+            raise
 
-        elif period == PeriodType.MONTHLY:
-            start = today.replace(day=1)
-            return start, today
+        await self.session.commit()
+        logger.info("touched_days_aggregation_completed", summaries_created=count)
 
-        elif period == PeriodType.YEARLY:
-            start = today.replace(month=1, day=1)
-            return start, today
+        return count
 
-        else:  # ALL_TIME
-            # Return a very early date
-            return date(2020, 1, 1), today
+    def _calculate_period_range(self, period: PeriodType) -> tuple[date, date]:
+        """Calculate start and end dates for a period type."""
+        return _period_range(period, date.today())
@@ -4,18 +4,35 @@ Activity sync service for syncing activities from Notion.
 This service handles syncing conversation and task activities from Notion databases.
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict
+import asyncio
+import time
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Optional, List, Dict, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from notion_client import AsyncClient
 from src.repositories.person_repository import PersonRepository
 from src.repositories.activity_repository import ActivityRepository
+from src.schemas.person import Person
 from src.core.config import Config
-from src.core.logging import get_logger
+from src.core.logging import get_logger, timed
 
 logger = get_logger(__name__)
 config = Config()
 
+# Notion truncates last_edited_time to the minute, so re-read a small window
+# before the watermark to avoid missing edits made while the last sync ran.
+SYNC_OVERLAP = timedelta(minutes=2)
+
+# Cap on collected error messages so an error flood can't exhaust memory
+MAX_SYNC_ERRORS = 1000
+
+# Property names tried, in order, when extracting fields from a Notion page
+TITLE_PROPERTIES = ("Meeting name", "Name", "Task name", "Название бага или предложение по улучшению", "Title")
+PROJECT_PROPERTIES = ("Project Name", "Epic", "Project", "Project name")
+# Attendees for conversations, Person for tasks
+PEOPLE_PROPERTIES = ("Attendees", "Person", "Assigned To", "Assignee", "Assign")
+
 
 class ActivitySyncService:
     """Service for syncing activities from Notion databases."""
@@ -25,29 +42,42 @@ class ActivitySyncService:
         self.person_repo = PersonRepository(session)
         self.activity_repo = ActivityRepository(session)
         self.notion = AsyncClient(auth=config.NOTION_API_KEY)
+        # (person_id, UTC day) pairs written by this sync, so daily summaries
+        # can be refreshed for just those days instead of rescanning everything
+        self.touched_days: Set[Tuple[int, date]] = set()
+        # Conversations and tasks are fetched concurrently but share the
+        # session, which must not be used by two coroutines at once
+        self._db_lock = asyncio.Lock()
 
     async def sync_all(
         self,
-        incremental: bool = True
+        incremental: bool = True,
+        since: Optional[datetime] = None
     ) -> Dict:
         """
         Sync all activities from Notion databases.
 
         Uses database IDs from config (NOTION_CONVERSATION_DATABASE_ID, NOTION_KANBAN_DATABASE_ID).
+        In incremental mode, only pages edited since the last successful sync
+        of each database are fetched; the watermark is advanced to this run's
+        start time when a database syncs without errors.
 
         Args:
             incremental: Only sync recent changes if True
+            since: Override the stored watermark for incremental syncs
 
         Returns:
             Sync statistics
         """
-        start_time = datetime.utcnow()
+        # Wall-clock start is the next incremental watermark; duration uses a monotonic clock
+        start_time = datetime.now(timezone.utc)
+        t0 = time.perf_counter_ns()
         stats = {
             "conversations_synced": 0,
             "tasks_synced": 0,
             "persons_created": 0,
             "persons_updated": 0,
-            "errors": []
+            "errors": deque(maxlen=MAX_SYNC_ERRORS)
         }
 
         try:
@@ -55,44 +85,171 @@ class ActivitySyncService:
             conversation_db_id = config.NOTION_CONVERSATION_DATABASE_ID
             kanban_db_id = config.NOTION_KANBAN_DATABASE_ID
 
-            # Sync conversations
+            # (database_id, stats key, sync method) for each configured database
+            syncs = []
+
             if conversation_db_id:
                 logger.info("syncing_conversations_from_db", database_id=conversation_db_id)
-                conv_stats = await self.sync_conversations(
-                    conversation_db_id, incremental
-                )
-                stats["conversations_synced"] = conv_stats["synced"]
-                stats["persons_created"] += conv_stats["persons_created"]
-                stats["persons_updated"] += conv_stats["persons_updated"]
-                stats["errors"].extend(conv_stats["errors"])
+                syncs.append((conversation_db_id, "conversations_synced", self.sync_conversations))
             else:
                 logger.warning("no_conversation_database_id_in_config")
 
-            # Sync tasks
             if kanban_db_id:
                 logger.info("syncing_tasks_from_db", database_id=kanban_db_id)
-                task_stats = await self.sync_tasks(kanban_db_id, incremental)
-                stats["tasks_synced"] = task_stats["synced"]
-                stats["persons_created"] += task_stats["persons_created"]
-                stats["persons_updated"] += task_stats["persons_updated"]
-                stats["errors"].extend(task_stats["errors"])
+                syncs.append((kanban_db_id, "tasks_synced", self.sync_tasks))
             else:
                 logger.warning("no_kanban_database_id_in_config")
 
-            await self.session.commit()
+            # Resolve every watermark before creating the sync coroutines, so a
+            # failing lookup can't leave an already created one unawaited
+            since_by_db = [
+                await self._get_since(database_id, incremental, since)
+                for database_id, _, _ in syncs
+            ]
+
+            # Both databases are paginated concurrently; their writes take turns on the session
+            results = await asyncio.gather(
+                *(
+                    sync(database_id, incremental, since=db_since)
+                    for (database_id, _, sync), db_since in zip(syncs, since_by_db)
+                ),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+            for (database_id, key, _), db_stats in zip(syncs, results):
+                stats[key] = db_stats["synced"]
+                stats["persons_created"] += db_stats["persons_created"]
+                stats["persons_updated"] += db_stats["persons_updated"]
+                stats["errors"].extend(db_stats["errors"])
+                if not db_stats["errors"]:
+                    await self.activity_repo.set_last_successful_sync(
+                        database_id, start_time
+                    )
+
+            with timed("sync_commit", logger):
+                await self.session.commit()
 
         except Exception as e:
             logger.error("sync_all_failed", error=str(e))
             stats["errors"].append(f"Sync failed: {str(e)}")
             await self.session.rollback()
 
-        duration = (datetime.utcnow() - start_time).total_seconds()
+        duration = (time.perf_counter_ns() - t0) / 1e9
+        stats["errors"] = list(stats["errors"])
         logger.info("sync_completed", stats=stats, duration=duration)
 
         return {**stats, "sync_duration_seconds": duration}
 
+    async def _get_since(
+        self, database_id: str, incremental: bool, since: Optional[datetime]
+    ) -> Optional[datetime]:
+        """Resolve the last_edited_time lower bound for a database query."""
+        if not incremental:
+            return None
+        if since is not None:
+            return since
+        return await self.activity_repo.get_last_successful_sync(database_id)
+
+    async def _iter_pages(
+        self,
+        database_id: str,
+        since: Optional[datetime],
+        property_filter: Optional[Dict] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Yield result batches of a database query, one API response at a time.
+
+        Notion cursors are sequential, so the request for the next cursor is
+        started as soon as a response arrives and runs while the caller
+        processes the current batch.
+
+        Args:
+            database_id: Notion database ID to query
+            since: Only fetch pages edited on or after this time
+            property_filter: Extra Notion filter ANDed with the time filter
+
+        Yields:
+            List of page objects from each response
+        """
+        query_params = self._build_query_params(database_id, since, property_filter)
+        next_fetch = asyncio.create_task(self.notion.databases.query(**query_params))
+
+        try:
+            while next_fetch is not None:
+                response = await next_fetch
+                next_fetch = None
+
+                next_cursor = response.get("next_cursor")
+                if response.get("has_more") and next_cursor:
+                    next_fetch = asyncio.create_task(
+                        self.notion.databases.query(**query_params, start_cursor=next_cursor)
+                    )
+
+                yield response.get("results", [])
+        finally:
+            if next_fetch is not None:
+                next_fetch.cancel()
+
+    def _build_query_params(
+        self,
+        database_id: str,
+        since: Optional[datetime],
+        property_filter: Optional[Dict] = None
+    ) -> Dict:
+        """Build databases.query params, pushing the incremental and property filters to Notion."""
+        query_params = {"database_id": database_id, "page_size": 100}
+
+        filters = []
+        if since is not None:
+            filters.append({
+                "timestamp": "last_edited_time",
+                "last_edited_time": {
+                    "on_or_after": (since - SYNC_OVERLAP).isoformat()
+                }
+            })
+        if property_filter is not None:
+            filters.append(property_filter)
+
+        if len(filters) == 1:
+            query_params["filter"] = filters[0]
+        elif filters:
+            query_params["filter"] = {"and": filters}
+        return query_params
+
+    async def _done_filter(self, database_id: str) -> Optional[Dict]:
+        """
+        Build a Notion filter matching tasks whose Status is "Done".
+
+        Notion rejects a filter whose type doesn't match the property, so the
+        Status property's type (status or select) is read from the database
+        schema first.
+
+        Args:
+            database_id: Notion database ID for Kanban
+
+        Returns:
+            Filter dict, or None if the schema has no usable Status property
+        """
+        try:
+            database = await self.notion.databases.retrieve(database_id=database_id)
+        except Exception as e:
+            logger.warning("status_filter_unavailable", database_id=database_id, error=str(e))
+            return None
+
+        status_type = database.get("properties", {}).get("Status", {}).get("type")
+        if status_type not in ("status", "select"):
+            return None
+
+        return {"property": "Status", status_type: {"equals": "Done"}}
+
     async def sync_conversations(
-        self, database_id: str, incremental: bool = True
+        self,
+        database_id: str,
+        incremental: bool = True,
+        since: Optional[datetime] = None
     ) -> Dict:
         """
         Sync conversation activities from Notion conversation_db.
@@ -100,6 +257,7 @@ class ActivitySyncService:
         Args:
             database_id: Notion database ID for conversations
             incremental: Only sync recent changes if True
+            since: Only fetch pages edited on or after this time
 
         Returns:
             Sync statistics
@@ -110,130 +268,119 @@ class ActivitySyncService:
             "synced": 0,
             "persons_created": 0,
             "persons_updated": 0,
-            "errors": []
+            "errors": deque(maxlen=MAX_SYNC_ERRORS)
         }
 
         try:
-            # Query Notion database
-            has_more = True
-            start_cursor = None
-            all_pages = []
-
-            while has_more:
-                query_params = {"database_id": database_id, "page_size": 100}
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-
-                response = await self.notion.databases.query(**query_params)
-                all_pages.extend(response.get("results", []))
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
-
-            logger.info("conversations_fetched", count=len(all_pages))
-
-            # Process each conversation
-            conversation_activities = []
-            persons_to_create = []
-
-            for page in all_pages:
-                try:
-                    # Extract conversation data
-                    page_id = page["id"]
-                    created_time = datetime.fromisoformat(
-                        page["created_time"].replace("Z", "+00:00")
-                    )
-                    properties = page.get("properties", {})
+            fetched = 0
 
-                    # Get conversation title
-                    title = self._extract_title(properties)
+            # Query Notion database, processing each batch while the next one is fetched
+            async for batch in self._iter_pages(database_id, since):
+                async with self._db_lock:
+                    fetched += len(batch)
+                    conversation_activities = []
+                    people = []
 
-                    # Get attendees (people who participated in the conversation)
-                    attendees = self._extract_people(properties)
+                    # Process each conversation
+                    for page in batch:
+                        try:
+                            # Extract conversation data
+                            page_id = page["id"]
+                            created_time = datetime.fromisoformat(page["created_time"])
+                            properties = page.get("properties", {})
+
+                            # Get conversation title
+                            title = self._extract_title(properties)
+
+                            # Get attendees (people who participated in the conversation)
+                            attendees = self._extract_people(properties)
                     
-                    # If no attendees field, try to parse from title
-                    if not attendees and title:
-                        # Extract attendee name from title (format: "Name - Description")
-                        attendee_name = self._parse_attendee_from_title(title)
+                            # If no attendees field, try to parse from title
+                            if not attendees and title:
+                                # Extract attendee name from title (format: "Name - Description")
+                                attendee_name = self._parse_attendee_from_title(title)
                         
-                        if attendee_name:
-                            # Try to find person by name in database
-                            try:
-                                from src.repositories.person_repository import PersonRepository
-                                person_repo_local = PersonRepository(self.activity_repo.session)
-                                persons, _ = await person_repo_local.get_all(search=attendee_name, limit=1)
+                                if attendee_name:
+                                    # Try to find person by name in database
+                                    try:
+                                        from src.repositories.person_repository import PersonRepository
+                                        person_repo_local = PersonRepository(self.activity_repo.session)
+                                        persons, _ = await person_repo_local.get_all(search=attendee_name, limit=1)
                                 
-                                if persons:
-                                    person = persons[0]
-                                    attendees = [{
-                                        "id": person.notion_id,
-                                        "name": person.username,
-                                        "avatar_url": person.avatar_url
-                                    }]
-                                    logger.info("attendee_parsed_from_title", 
-                                              title=title, 
-                                              attendee=attendee_name,
-                                              person_id=person.id)
-                            except Exception as e:
-                                logger.warning("failed_to_parse_attendee", title=title, error=str(e))
+                                        if persons:
+                                            person = persons[0]
+                                            attendees = [{
+                                                "id": person.notion_id,
+                                                "name": person.username,
+                                                "avatar_url": person.avatar_url
+                                            }]
+                                            logger.info("attendee_parsed_from_title", 
+                                                      title=title, 
+                                                      attendee=attendee_name,
+                                                      person_id=person.id)
+                                    except Exception as e:
+                                        logger.warning("failed_to_parse_attendee", title=title, error=str(e))
                     
-                    # If still no attendees, fall back to creator
-                    if not attendees:
-                        created_by = page.get("created_by", {})
-                        creator_id = created_by.get("id")
-                        creator_name = created_by.get("name", "Unknown")
+                            # If still no attendees, fall back to creator
+                            if not attendees:
+                                created_by = page.get("created_by", {})
+                                creator_id = created_by.get("id")
+                                creator_name = created_by.get("name", "Unknown")
                         
-                        if creator_id:
-                            attendees = [{
-                                "id": creator_id,
-                                "name": creator_name,
-                                "avatar_url": created_by.get("avatar_url")
-                            }]
+                                if creator_id:
+                                    attendees = [{
+                                        "id": creator_id,
+                                        "name": creator_name,
+                                        "avatar_url": created_by.get("avatar_url")
+                                    }]
                     
-                    if not attendees:
-                        logger.warning("conversation_no_attendees", page_id=page_id)
+                            if not attendees:
+                                logger.warning("conversation_no_attendees", page_id=page_id)
+                                continue
+
+                            # Prepare one activity per attendee; person IDs are filled in below
+                            for attendee_data in attendees:
+                                people.append(attendee_data)
+                                conversation_activities.append({
+                                    "notion_conversation_id": page_id,
+                                    "conversation_title": title,
+                                    "created_at": created_time,
+                                    # Only what the app reads back; the raw properties
+                                    # would add kilobytes to every row
+                                    "notion_metadata": {"notion_url": page.get("url")}
+                                })
+
+                        except Exception as e:
+                            error_msg = f"Error processing conversation {page.get('id')}: {str(e)}"
+                            logger.error("conversation_processing_error", error=error_msg)
+                            stats["errors"].append(error_msg)
+
+                    if not conversation_activities:
                         continue
 
-                    # Create one activity per attendee
-                    for attendee_data in attendees:
-                        attendee_id = attendee_data["id"]
-                        attendee_name = attendee_data["name"]
-                        avatar_url = attendee_data.get("avatar_url")
-
-                        # Get or create person
-                        person, created = await self.person_repo.get_or_create_by_notion_id(
-                            notion_id=attendee_id,
-                            username=attendee_name,
-                            avatar_url=avatar_url
-                        )
-
-                        if created:
-                            stats["persons_created"] += 1
-                        else:
-                            stats["persons_updated"] += 1
-
-                        # Prepare conversation activity
-                        conversation_activities.append({
-                            "person_id": person.id,
-                            "notion_conversation_id": page_id,
-                            "conversation_title": title,
-                            "created_at": created_time,
-                            "notion_metadata": {
-                                "notion_url": page.get("url"),
-                                "properties": properties
-                            }
-                        })
+                    try:
+                        # Savepoint so a failing batch doesn't abort the rest of the
+                        # sync (the task sync shares this session too)
+                        async with self.session.begin_nested():
+                            # Resolve the batch's people in one lookup instead of one per attendee
+                            resolved = await self._get_or_create_people(people)
+                            for activity, (person, _) in zip(conversation_activities, resolved):
+                                activity["person_id"] = person.id
+
+                            # Bulk create this batch's conversations so memory stays bounded by the page size
+                            with timed("bulk_create_conversations", logger, rows=len(conversation_activities)):
+                                created = await self.activity_repo.bulk_create_conversations(
+                                    conversation_activities
+                                )
+                    except Exception as e:
+                        error_msg = f"Error saving {len(conversation_activities)} conversations: {str(e)}"
+                        logger.error("conversation_batch_error", error=error_msg)
+                        stats["errors"].append(error_msg)
+                        continue
 
-                except Exception as e:
-                    error_msg = f"Error processing conversation {page.get('id')}: {str(e)}"
-                    logger.error("conversation_processing_error", error=error_msg)
-                    stats["errors"].append(error_msg)
+                    self._record_batch(stats, resolved, created, conversation_activities, "created_at")
 
-            # Bulk create conversations
-            if conversation_activities:
-                created = await self.activity_repo.bulk_create_conversations(
-                    conversation_activities
-                )
-                stats["synced"] = len(created)
+            logger.info("conversations_fetched", count=fetched)
 
         except Exception as e:
             error_msg = f"Error syncing conversations: {str(e)}"
@@ -242,7 +389,12 @@ class ActivitySyncService:
 
         return stats
 
-    async def sync_tasks(self, database_id: str, incremental: bool = True) -> Dict:
+    async def sync_tasks(
+        self,
+        database_id: str,
+        incremental: bool = True,
+        since: Optional[datetime] = None
+    ) -> Dict:
         """
         Sync task completions from Notion Kanban database.
 
@@ -251,6 +403,7 @@ class ActivitySyncService:
         Args:
             database_id: Notion database ID for Kanban
             incremental: Only sync recent changes if True
+            since: Only fetch pages edited on or after this time
 
         Returns:
             Sync statistics
@@ -261,121 +414,113 @@ class ActivitySyncService:
             "synced": 0,
             "persons_created": 0,
             "persons_updated": 0,
-            "errors": []
+            "errors": deque(maxlen=MAX_SYNC_ERRORS)
         }
 
         try:
-            # Query Notion database for "Done" tasks
-            has_more = True
-            start_cursor = None
-            all_pages = []
-
-            while has_more:
-                query_params = {"database_id": database_id, "page_size": 100}
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-
-                response = await self.notion.databases.query(**query_params)
-                all_pages.extend(response.get("results", []))
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
-
-            logger.info("tasks_fetched", count=len(all_pages))
-
-            # Process each task
-            task_activities = []
-
-            for page in all_pages:
-                try:
-                    page_id = page["id"]
-                    properties = page.get("properties", {})
-                    last_edited_time = datetime.fromisoformat(
-                        page["last_edited_time"].replace("Z", "+00:00")
-                    )
+            fetched = 0
 
-                    # Check status
-                    status_prop = properties.get("Status", {})
-                    status_name = None
-                    if status_prop.get("select"):
-                        status_name = status_prop["select"].get("name")
-                    elif status_prop.get("status"):
-                        status_name = status_prop["status"].get("name")
+            # Only Done tasks are synced, so let Notion skip the rest
+            done_filter = await self._done_filter(database_id)
 
-                    # Only process "Done" tasks
-                    if status_name != "Done":
-                        continue
+            # Query Notion database, processing each batch while the next one is fetched
+            async for batch in self._iter_pages(database_id, since, done_filter):
+                async with self._db_lock:
+                    fetched += len(batch)
+                    task_activities = []
+                    people = []
 
-                    # Get completion date from "Date Done" property (NOT last_edited_time!)
-                    completed_at = None
-                    date_done_prop = properties.get("Date Done", {})
-                    if date_done_prop.get("date") and date_done_prop["date"].get("start"):
+                    # Process each task
+                    for page in batch:
                         try:
-                            completed_at = datetime.fromisoformat(
-                                date_done_prop["date"]["start"].replace("Z", "+00:00")
-                            )
-                        except Exception as e:
-                            logger.warning("failed_to_parse_date_done", page_id=page_id, error=str(e))
+                            page_id = page["id"]
+                            properties = page.get("properties", {})
+
+                            # Check status
+                            status_prop = properties.get("Status", {})
+                            status_name = None
+                            if status_prop.get("select"):
+                                status_name = status_prop["select"].get("name")
+                            elif status_prop.get("status"):
+                                status_name = status_prop["status"].get("name")
+
+                            # Only process "Done" tasks (Notion already filters when the schema allows)
+                            if status_name != "Done":
+                                continue
+
+                            last_edited_time = datetime.fromisoformat(page["last_edited_time"])
+
+                            # Get completion date from "Date Done" property (NOT last_edited_time!)
+                            completed_at = None
+                            date_done_prop = properties.get("Date Done", {})
+                            if date_done_prop.get("date") and date_done_prop["date"].get("start"):
+                                try:
+                                    completed_at = datetime.fromisoformat(date_done_prop["date"]["start"])
+                                except Exception as e:
+                                    logger.warning("failed_to_parse_date_done", page_id=page_id, error=str(e))
                     
-                    # Fallback to last_edited_time if Date Done is not available
-                    if not completed_at:
-                        completed_at = last_edited_time
-                        logger.warning("using_last_edited_time_fallback", page_id=page_id, title=properties.get("Name", {}).get("title", [{}])[0].get("plain_text", "Unknown"))
-
-                    # Get task title
-                    title = self._extract_title(properties)
-
-                    # Get project name
-                    project_name = self._extract_project(properties)
+                            # Fallback to last_edited_time if Date Done is not available
+                            if not completed_at:
+                                completed_at = last_edited_time
+                                logger.warning("using_last_edited_time_fallback", page_id=page_id, title=properties.get("Name", {}).get("title", [{}])[0].get("plain_text", "Unknown"))
+
+                            # Get task title
+                            title = self._extract_title(properties)
+
+                            # Get project name
+                            project_name = self._extract_project(properties)
+
+                            # Get assigned person
+                            assigned_people = self._extract_people(properties)
+
+                            if not assigned_people:
+                                logger.warning("task_no_assignee", page_id=page_id)
+                                continue
+
+                            # Prepare one activity per assigned person; person IDs are filled in below
+                            for person_data in assigned_people:
+                                people.append(person_data)
+                                task_activities.append({
+                                    "notion_task_id": page_id,
+                                    "task_title": title,
+                                    "project_name": project_name,
+                                    "completed_at": completed_at,
+                                    "last_status_change": last_edited_time,
+                                    "notion_metadata": {
+                                        "notion_url": page.get("url"),
+                                        "status": status_name
+                                    }
+                                })
 
-                    # Get assigned person
-                    assigned_people = self._extract_people(properties)
+                        except Exception as e:
+                            error_msg = f"Error processing task {page.get('id')}: {str(e)}"
+                            logger.error("task_processing_error", error=error_msg)
+                            stats["errors"].append(error_msg)
 
-                    if not assigned_people:
-                        logger.warning("task_no_assignee", page_id=page_id)
+                    if not task_activities:
                         continue
 
-                    # Process each assigned person
-                    for person_data in assigned_people:
-                        person_id = person_data["id"]
-                        person_name = person_data["name"]
-                        avatar_url = person_data.get("avatar_url")
-
-                        # Get or create person
-                        person, created = await self.person_repo.get_or_create_by_notion_id(
-                            notion_id=person_id,
-                            username=person_name,
-                            avatar_url=avatar_url
-                        )
-
-                        if created:
-                            stats["persons_created"] += 1
-                        else:
-                            stats["persons_updated"] += 1
-
-                        # Prepare task activity
-                        task_activities.append({
-                            "person_id": person.id,
-                            "notion_task_id": page_id,
-                            "task_title": title,
-                            "project_name": project_name,
-                            "completed_at": completed_at,
-                            "last_status_change": last_edited_time,
-                            "notion_metadata": {
-                                "notion_url": page.get("url"),
-                                "status": status_name,
-                                "properties": properties
-                            }
-                        })
+                    try:
+                        # Savepoint so a failing batch doesn't abort the rest of the
+                        # sync (the conversation sync shares this session too)
+                        async with self.session.begin_nested():
+                            # Resolve the batch's people in one lookup instead of one per assignee
+                            resolved = await self._get_or_create_people(people)
+                            for activity, (person, _) in zip(task_activities, resolved):
+                                activity["person_id"] = person.id
+
+                            # Bulk create this batch's tasks so memory stays bounded by the page size
+                            with timed("bulk_create_tasks", logger, rows=len(task_activities)):
+                                created = await self.activity_repo.bulk_create_tasks(task_activities)
+                    except Exception as e:
+                        error_msg = f"Error saving {len(task_activities)} tasks: {str(e)}"
+                        logger.error("task_batch_error", error=error_msg)
+                        stats["errors"].append(error_msg)
+                        continue
 
-                except Exception as e:
-                    error_msg = f"Error processing task {page.get('id')}: {str(e)}"
-                    logger.error("task_processing_error", error=error_msg)
-                    stats["errors"].append(error_msg)
+                    self._record_batch(stats, resolved, created, task_activities, "completed_at")
 
-            # Bulk create tasks
-            if task_activities:
-                created = await self.activity_repo.bulk_create_tasks(task_activities)
-                stats["synced"] = len(created)
+            logger.info("tasks_fetched", count=fetched)
 
         except Exception as e:
             error_msg = f"Error syncing tasks: {str(e)}"
@@ -384,12 +529,73 @@ class ActivitySyncService:
 
         return stats
 
+    async def _get_or_create_people(self, people: List[Dict]) -> List[Tuple[Person, bool]]:
+        """
+        Get or create the persons for a batch of extracted people.
+
+        Uses one SELECT and at most one INSERT for the whole batch; people
+        that appear several times count as created only the first time.
+
+        Args:
+            people: People dicts from _extract_people, in activity order
+
+        Returns:
+            Tuples of (Person object, created flag) in the same order as ``people``
+        """
+        return await self.person_repo.bulk_get_or_create([
+            {
+                "notion_id": person_data["id"],
+                "username": person_data["name"],
+                "avatar_url": person_data.get("avatar_url")
+            }
+            for person_data in people
+        ])
+
+    def _record_batch(
+        self,
+        stats: Dict,
+        resolved: List[Tuple[Person, bool]],
+        created: int,
+        activities: List[Dict],
+        time_key: str
+    ) -> None:
+        """
+        Count a saved batch in the sync statistics and remember its days.
+
+        Called only once the batch's savepoint is released, so a rolled back
+        batch neither counts nor triggers re-aggregation.
+
+        Args:
+            stats: Sync statistics to update
+            resolved: (Person object, created flag) tuples from _get_or_create_people
+            created: Number of newly inserted activities
+            activities: The batch's activity rows, with person_id filled in
+            time_key: Activity field holding the timestamp the day is taken from
+        """
+        for _, person_created in resolved:
+            if person_created:
+                stats["persons_created"] += 1
+            else:
+                stats["persons_updated"] += 1
+
+        stats["synced"] += created
+
+        for activity in activities:
+            self.touched_days.add((activity["person_id"], self._utc_day(activity[time_key])))
+
+    @staticmethod
+    def _utc_day(value: datetime) -> date:
+        """Get the UTC calendar day that a timestamp is aggregated under."""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+
     def _extract_title(self, properties: Dict) -> str:
         """Extract title from Notion properties."""
         # Try common title property names
-        for prop_name in ["Meeting name", "Name", "Task name", "Название бага или предложение по улучшению", "Title"]:
-            if prop_name in properties:
-                title_prop = properties[prop_name]
+        for prop_name in TITLE_PROPERTIES:
+            title_prop = properties.get(prop_name)
+            if title_prop is not None:
                 if title_prop.get("type") == "title" and title_prop.get("title"):
                     title = "".join([t.get("plain_text", "") for t in title_prop["title"]])
                     if title.strip():  # Only return if not empty
@@ -399,9 +605,9 @@ class ActivitySyncService:
 
     def _extract_project(self, properties: Dict) -> Optional[str]:
         """Extract project name from Notion properties."""
-        for prop_name in ["Project Name", "Epic", "Project", "Project name"]:
-            if prop_name in properties:
-                prop = properties[prop_name]
+        for prop_name in PROJECT_PROPERTIES:
+            prop = properties.get(prop_name)
+            if prop is not None:
                 
                 # Handle multi_select (e.g., "Project Name" in Kanban)
                 if prop.get("type") == "multi_select" and prop.get("multi_select"):
@@ -430,12 +636,15 @@ class ActivitySyncService:
         """Extract people from Notion properties."""
         people = []
 
-        # Try common people property names (Attendees for conversations, Person for tasks)
-        for prop_name in ["Attendees", "Person", "Assigned To", "Assignee", "Assign"]:
-            if prop_name in properties:
-                prop = properties[prop_name]
+        # Try common people property names
+        for prop_name in PEOPLE_PROPERTIES:
+            prop = properties.get(prop_name)
+            if prop is not None:
                 if prop.get("type") == "people" and prop.get("people"):
                     for person in prop["people"]:
+                        # Person IDs are required; skip malformed entries
+                        if person.get("id") is None:
+                            continue
                         people.append({
                             "id": person.get("id"),
                             "name": person.get("name", "Unknown"),
@@ -79,28 +79,23 @@ class AuthService:
             # Hash the password
             hashed_password = hash_password(user_data.password)
 
-            # Create the user
-            user = await self.auth_repository.create_user(
+            # Create the user and store their refresh token
+            refresh_token = generate_refresh_token()
+            user, _ = await self.auth_repository.create_user_with_refresh_token(
                 username=user_data.username,
                 email=user_data.email,
-                hashed_password=hashed_password
-            )
-
-            # Generate tokens
-            access_token = create_access_token(
-                data={"sub": str(user.id), "username": user.username}
-            )
-            refresh_token = generate_refresh_token()
-
-            # Store refresh token
-            await self.auth_repository.create_refresh_token(
-                user_id=user.id,
+                hashed_password=hashed_password,
                 token=refresh_token,
                 expires_days=config.REFRESH_TOKEN_EXPIRE_DAYS,
                 user_agent=user_agent,
                 ip_address=ip_address
             )
 
+            # Generate access token
+            access_token = create_access_token(
+                data={"sub": str(user.id), "username": user.username}
+            )
+
             logger.info(
                 "user_registered_successfully",
                 user_id=user.id,
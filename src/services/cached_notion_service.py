@@ -30,6 +30,11 @@ from src.models.notion import (
 )
 
 
+def _iso_date(value: Optional[date]) -> Optional[str]:
+    """Format a cached DATE column the way the Notion API models expect it"""
+    return value.isoformat() if value else None
+
+
 class CachedNotionService:
     """Service layer that reads Notion data from cache"""
 
@@ -157,7 +162,7 @@ class CachedNotionService:
                     priority=cached_task.priority,
                     effort_level=cached_task.effort_level,
                     description=cached_task.description,
-                    due_date=cached_task.due_date,
+                    due_date=_iso_date(cached_task.due_date),
                     task_type=cached_task.task_type or [],
                     assignee=cached_task.assignee or []
                 )
@@ -225,7 +230,7 @@ class CachedNotionService:
                         priority=cached_task.priority,
                         effort_level=cached_task.effort_level,
                         description=cached_task.description,
-                        due_date=cached_task.due_date,
+                        due_date=_iso_date(cached_task.due_date),
                         task_type=cached_task.task_type or [],
                         assignee=cached_task.assignee or []
                     )
@@ -274,8 +279,8 @@ class CachedNotionService:
                     properties=TodoProperties(
                         name=cached_todo.task_name,
                         status=cached_todo.status,
-                        deadline=cached_todo.deadline,
-                        date_done=cached_todo.date_done,
+                        deadline=_iso_date(cached_todo.deadline),
+                        date_done=_iso_date(cached_todo.date_done),
                         is_overdue=cached_todo.is_overdue,
                         project_ids=cached_todo.project_ids or []
                     )
@@ -341,8 +346,8 @@ class CachedNotionService:
                     properties=TodoProperties(
                         name=cached_todo.task_name,
                         status=cached_todo.status,
-                        deadline=cached_todo.deadline,
-                        date_done=cached_todo.date_done,
+                        deadline=_iso_date(cached_todo.deadline),
+                        date_done=_iso_date(cached_todo.date_done),
                         is_overdue=True,
                         project_ids=cached_todo.project_ids or []
                     )
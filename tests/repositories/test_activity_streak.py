@@ -0,0 +1,114 @@
+import pytest
+import pytest_asyncio
+from datetime import date, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.config import Config
+from src.repositories.activity_repository import ActivityRepository
+from src.schemas.person import ActivitySummary, Person
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Session inside a transaction that is rolled back after the test."""
+    engine = create_async_engine(Config().db_url)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+            yield session
+        await transaction.rollback()
+    await engine.dispose()
+
+
+async def make_person(session: AsyncSession, active_days: list[int]) -> int:
+    """Create a person active on the given days (offsets from today, e.g. -1 for yesterday)."""
+    person = Person(notion_id="test-streak-person", username="Streak Test")
+    session.add(person)
+    await session.flush()
+
+    today = date.today()
+    session.add_all([
+        ActivitySummary(
+            person_id=person.id,
+            date=today + timedelta(days=offset),
+            conversations_created=1,
+            tasks_completed=0,
+            total_activity_score=1
+        )
+        for offset in active_days
+    ])
+    await session.flush()
+    return person.id
+
+
+class TestCalculateStreak:
+    """Test the SQL gaps-and-islands streak calculation."""
+
+    @pytest.mark.asyncio
+    async def test_empty_history(self, session):
+        """A person without activity has no streaks."""
+        person_id = await make_person(session, [])
+
+        streak = await ActivityRepository(session).calculate_streak(person_id)
+
+        assert streak == {
+            "current_streak": 0,
+            "longest_streak": 0,
+            "current_streak_start": None,
+            "longest_streak_start": None,
+            "longest_streak_end": None
+        }
+
+    @pytest.mark.asyncio
+    async def test_single_day(self, session):
+        """One active day today is both the current and the longest streak."""
+        person_id = await make_person(session, [0])
+        today = date.today()
+
+        streak = await ActivityRepository(session).calculate_streak(person_id)
+
+        assert streak == {
+            "current_streak": 1,
+            "longest_streak": 1,
+            "current_streak_start": today,
+            "longest_streak_start": today,
+            "longest_streak_end": today
+        }
+
+    @pytest.mark.asyncio
+    async def test_tie_between_equal_runs_prefers_earliest(self, session):
+        """Of two equally long runs, the earlier one is the longest streak."""
+        person_id = await make_person(session, [-20, -19, -18, -10, -9, -8])
+        today = date.today()
+
+        streak = await ActivityRepository(session).calculate_streak(person_id)
+
+        assert streak["longest_streak"] == 3
+        assert streak["longest_streak_start"] == today - timedelta(days=20)
+        assert streak["longest_streak_end"] == today - timedelta(days=18)
+        assert streak["current_streak"] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_ending_yesterday_is_current(self, session):
+        """A run that ended yesterday still counts as the current streak."""
+        person_id = await make_person(session, [-3, -2, -1])
+        today = date.today()
+
+        streak = await ActivityRepository(session).calculate_streak(person_id)
+
+        assert streak["current_streak"] == 3
+        assert streak["current_streak_start"] == today - timedelta(days=3)
+        assert streak["longest_streak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_run_ending_two_days_ago_is_not_current(self, session):
+        """A run that ended two days ago is broken."""
+        person_id = await make_person(session, [-4, -3, -2])
+        today = date.today()
+
+        streak = await ActivityRepository(session).calculate_streak(person_id)
+
+        assert streak["current_streak"] == 0
+        assert streak["current_streak_start"] is None
+        assert streak["longest_streak"] == 3
+        assert streak["longest_streak_end"] == today - timedelta(days=2)
@@ -0,0 +1,105 @@
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+
+from src.repositories.cache_repository import CacheRepository
+from src.schemas.notion_cache import CachedNotionTask, CachedNotionTodo
+
+
+def replace_cache(model, objects):
+    """Run _replace_cache against a mocked session and return (COPY statement, COPY data, session)."""
+    db = MagicMock()
+    cursor = db.connection.return_value.connection.cursor.return_value
+    copied = {}
+
+    def copy_expert(sql, buffer):
+        copied["sql"] = sql
+        copied["data"] = buffer.read()
+
+    cursor.copy_expert.side_effect = copy_expert
+
+    CacheRepository(db)._replace_cache(model, objects)
+
+    cursor.close.assert_called_once()
+    return copied["sql"], copied["data"], db
+
+
+class TestReplaceCacheCopy:
+    """Test the COPY text format written by _replace_cache."""
+
+    def test_copy_statement_skips_server_default_columns(self):
+        """cached_at is filled by the database, so it is not copied."""
+        sql, data, db = replace_cache(CachedNotionTodo, [])
+
+        assert sql == (
+            "COPY cached_notion_todos (todo_id, member_name, task_name, status, deadline, "
+            "date_done, is_overdue, project_ids, url) FROM STDIN"
+        )
+        assert data == ""
+        assert str(db.execute.call_args.args[0]) == "TRUNCATE cached_notion_todos"
+        db.commit.assert_called_once()
+
+    def test_escapes_special_characters_and_encodes_values(self):
+        """Tab, newline, carriage return and backslash are escaped; None is \\N."""
+        todo = CachedNotionTodo(
+            todo_id="todo-1",
+            member_name="Tab\there",
+            task_name="Line\nbreak\r and back\\slash",
+            status=None,
+            deadline=date(2026, 10, 1),
+            is_overdue=True,
+            project_ids=["a", "b\tc"],
+            url="https://example.com/a"
+        )
+
+        _, data, _ = replace_cache(CachedNotionTodo, [todo])
+
+        assert data == (
+            "todo-1\t"
+            "Tab\\there\t"
+            "Line\\nbreak\\r and back\\\\slash\t"
+            "\\N\t"
+            "2026-10-01\t"
+            "\\N\t"
+            "True\t"
+            '["a", "b\\\\tc"]\t'
+            "https://example.com/a\n"
+        )
+
+    def test_applies_python_side_defaults(self):
+        """Unset columns get their Python-side default, since COPY skips them."""
+        todo = CachedNotionTodo(
+            todo_id="todo-2",
+            member_name="Member",
+            task_name="Task",
+            url="https://example.com/b"
+        )
+
+        _, data, _ = replace_cache(CachedNotionTodo, [todo])
+
+        # status/deadline/date_done have no default; is_overdue=False, project_ids=list
+        assert data == "todo-2\tMember\tTask\t\\N\t\\N\t\\N\tFalse\t[]\thttps://example.com/b\n"
+
+    def test_one_line_per_row_with_timestamps(self):
+        """Each object becomes one line; datetimes are written in ISO format."""
+        created = datetime(2026, 10, 1, 9, 30, tzinfo=timezone.utc)
+        tasks = [
+            CachedNotionTask(
+                page_id=f"page-{i}",
+                task_name=f"Task {i}",
+                due_date=None,
+                assignee=[{"name": "A"}],
+                notion_created_time=created,
+                notion_last_edited_time=created
+            )
+            for i in range(2)
+        ]
+
+        _, data, _ = replace_cache(CachedNotionTask, tasks)
+
+        lines = data.split("\n")
+        assert lines[-1] == ""
+        assert lines[:-1] == [
+            f"page-{i}\tTask {i}\t\\N\t\\N\t\\N\t\\N\t\\N\t[]\t"
+            f'[{{"name": "A"}}]\t2026-10-01T09:30:00+00:00\t2026-10-01T09:30:00+00:00'
+            for i in range(2)
+        ]
@@ -0,0 +1,159 @@
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from src.db.sync_database import sync_engine
+from src.repositories import cache_repository
+from src.repositories.cache_repository import CacheRepository
+from src.schemas.notion_cache import CachedNotionProject
+
+NOW = datetime(2026, 10, 1, 9, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db():
+    """Session whose commits are savepoints of a transaction rolled back after the test."""
+    cache_repository._table_rows.clear()
+    with sync_engine.connect() as conn:
+        transaction = conn.begin()
+        session = Session(bind=conn, join_transaction_mode="create_savepoint")
+        session.execute(delete(CachedNotionProject))
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+    cache_repository._table_rows.clear()
+
+
+def project(page_id: str, **values) -> CachedNotionProject:
+    """A fully populated project, with the given values overridden."""
+    fields = {
+        "page_id": page_id,
+        "project_name": f"Project {page_id}",
+        "status": "In progress",
+        "assignees": ["Alice"],
+        "url": f"https://example.com/{page_id}",
+        "notion_created_time": NOW,
+        "notion_last_edited_time": NOW,
+    }
+    fields.update(values)
+    return CachedNotionProject(**fields)
+
+
+def partial(page_id: str, **values) -> CachedNotionProject:
+    """A project with only the NOT NULL columns and the given values set.
+
+    Postgres checks NOT NULL on the proposed row before the conflict, so
+    even an update has to carry the required columns.
+    """
+    return CachedNotionProject(
+        page_id=page_id,
+        project_name=values.pop("project_name", f"Project {page_id}"),
+        url=f"https://example.com/{page_id}",
+        notion_created_time=NOW,
+        notion_last_edited_time=NOW,
+        **values
+    )
+
+
+def stored(db: Session) -> dict:
+    """Stored projects by page_id, as (project_name, status, health_color, assignees, url)."""
+    rows = db.execute(
+        select(
+            CachedNotionProject.page_id,
+            CachedNotionProject.project_name,
+            CachedNotionProject.status,
+            CachedNotionProject.health_color,
+            CachedNotionProject.assignees,
+            CachedNotionProject.url
+        )
+    ).all()
+    return {row.page_id: tuple(row[1:]) for row in rows}
+
+
+class TestUpsertProjects:
+    """Test INSERT ... ON CONFLICT upserts of cached projects."""
+
+    def test_mixed_partial_projects_in_one_call(self, db):
+        """Projects setting different attributes are each written with their own columns."""
+        repo = CacheRepository(db)
+        repo.upsert_projects([project("p1"), project("p2")])
+
+        repo.upsert_projects([
+            # Only the required columns: status and assignees are left alone
+            partial("p1", project_name="Renamed"),
+            # A new, fully populated project: inserted with every column
+            project("p3", status="Done", health_color="green"),
+            # More attributes than the first project
+            partial("p2", status="Done", health_color="red"),
+        ])
+
+        assert stored(db) == {
+            "p1": ("Renamed", "In progress", None, ["Alice"], "https://example.com/p1"),
+            "p2": ("Project p2", "Done", "red", ["Alice"], "https://example.com/p2"),
+            "p3": ("Project p3", "Done", "green", ["Alice"], "https://example.com/p3"),
+        }
+
+    def test_insert_applies_defaults(self, db):
+        """An inserted project without assignees gets the column default."""
+        CacheRepository(db).upsert_projects([partial("p1")])
+
+        assert stored(db)["p1"][3] == []
+
+    def test_last_duplicate_wins(self, db):
+        """A page_id repeated in one call is written once, with the last values."""
+        CacheRepository(db).upsert_projects([
+            project("p1", status="Draft"),
+            project("p1", status="Done"),
+        ])
+
+        assert stored(db)["p1"][1] == "Done"
+
+
+class TestCachedProjectsVersioning:
+    """Test the process-wide cache of project rows keyed on cache_metadata.last_updated."""
+
+    def test_rows_reused_until_last_updated_moves(self, db):
+        """Rows are re-read only after a refresh moves last_updated."""
+        repo = CacheRepository(db)
+        repo.upsert_projects([project("p1")])
+        repo.update_cache_metadata("projects", total_records=1, update_duration_seconds=0)
+        assert [row.page_id for row in repo.get_all_cached_projects()] == ["p1"]
+
+        # Written without moving last_updated: the stored rows are reused
+        db.execute(insert(CachedNotionProject).values(
+            page_id="p2", project_name="Project p2", url="u",
+            notion_created_time=NOW, notion_last_edited_time=NOW
+        ))
+        assert [row.page_id for row in repo.get_all_cached_projects()] == ["p1"]
+
+        repo.update_cache_metadata("projects", total_records=2, update_duration_seconds=0)
+        assert sorted(row.page_id for row in repo.get_all_cached_projects()) == ["p1", "p2"]
+
+    def test_upsert_invalidates_stored_rows(self, db):
+        """upsert_projects bumps last_updated, so the next read sees its rows."""
+        repo = CacheRepository(db)
+        repo.update_cache_metadata("projects", total_records=0, update_duration_seconds=0)
+        assert repo.get_all_cached_projects() == []
+
+        repo.upsert_projects([project("p1")])
+        assert [row.project_name for row in repo.get_all_cached_projects()] == ["Project p1"]
+
+        repo.upsert_projects([partial("p1", project_name="Renamed")])
+        assert [row.project_name for row in repo.get_all_cached_projects()] == ["Renamed"]
+
+    def test_shared_rows_are_read_only(self, db):
+        """Callers can't change the rows other callers get."""
+        repo = CacheRepository(db)
+        repo.upsert_projects([project("p1", assignees=["Alice", "Bob"])])
+        repo.update_cache_metadata("projects", total_records=1, update_duration_seconds=0)
+
+        row = repo.get_all_cached_projects()[0]
+        with pytest.raises(AttributeError):
+            row.project_name = "Changed"
+        with pytest.raises(AttributeError):
+            row.assignees.append("Eve")
+
+        assert repo.get_all_cached_projects()[0].assignees == ("Alice", "Bob")